@@ -0,0 +1,261 @@
+"""Нагрузочный тест представлений blog на синтетических наборах данных.
+
+Для каждого представления выполняет серию запросов через тестовый клиент
+Django и печатает задержку (p50/p95/p99), число SQL-запросов и размер
+ответа. Результат можно сохранить как эталон и сравнивать с ним
+последующие прогоны: скрипт завершается с кодом 1, если p95 вырос больше
+порога или увеличилось число запросов.
+
+Набор данных создаётся командой generate_dataset один раз в
+benchmarks/data/<набор>.sqlite3, каждый прогон работает с его копией.
+
+Запуск:
+    python benchmarks/bench_views.py --size 1k
+    python benchmarks/bench_views.py --size 1k --save-baseline
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCHMARKS_DIR / 'data'
+BASELINES_DIR = BENCHMARKS_DIR / 'baselines'
+
+# Имя набора -> число постов
+SIZES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / 'blogicum'))
+
+
+def setup_django():
+    """Инициализирует Django с настройками проекта."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    import django
+    django.setup()
+
+
+def use_database(path):
+    """Переключает соединение по умолчанию на файл базы path."""
+    from django.db import connection
+
+    connection.close()
+    connection.settings_dict['NAME'] = str(path)
+
+
+def prepare_dataset(size, seed):
+    """
+    Создаёт набор данных, если его ещё нет.
+
+    Returns:
+        Path: Файл базы с набором
+    """
+    path = DATA_DIR / f'{size}-{seed}.sqlite3'
+    if path.exists():
+        return path
+    DATA_DIR.mkdir(exist_ok=True)
+    partial = path.with_suffix('.partial')
+    partial.unlink(missing_ok=True)
+    use_database(partial)
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    call_command('generate_dataset', posts=SIZES[size], seed=seed,
+                 skip_search_index=True, verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    connection.close()
+    print(f'Набор {size} создан за {time.perf_counter() - started:.0f} с')
+    partial.rename(path)
+    return path
+
+
+def get_scenarios():
+    """
+    Сценарии: (имя, метод, адрес, данные формы, пользователь).
+
+    Для постов берётся самый комментируемый видимый пост, для профиля и
+    категории — самые наполненные.
+    """
+    from django.db.models import Count
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    post = Post.objects.filter(
+        is_visible=True, pub_date__lte=timezone.now()
+    ).annotate(comment_count=Count('comments')).order_by(
+        '-comment_count'
+    ).select_related('author').first()
+    author = post.author
+    category = Category.objects.filter(is_published=True).annotate(
+        post_count=Count('posts')
+    ).order_by('-post_count').first()
+    post_data = {
+        'title': 'Новый пост нагрузочного теста',
+        'text': 'Текст поста нагрузочного теста.',
+        'pub_date': timezone.localtime().strftime('%Y-%m-%dT%H:%M'),
+        'category': post.category_id,
+    }
+    return [
+        ('index', 'get', '/', None, None),
+        ('index_last_page', 'get', '/?page=999999', None, None),
+        ('category_posts', 'get', f'/category/{category.slug}/', None,
+         None),
+        ('profile', 'get', f'/profile/{author.username}/', None, None),
+        ('profile_owner', 'get', f'/profile/{author.username}/', None,
+         author),
+        ('post_detail', 'get', f'/posts/{post.id}/', None, None),
+        ('create_post_form', 'get', '/posts/create/', None, author),
+        ('create_post', 'post', '/posts/create/', post_data, author),
+        ('edit_post_form', 'get', f'/posts/{post.id}/edit/', None, author),
+        ('edit_post', 'post', f'/posts/{post.id}/edit/', post_data, author),
+        ('add_comment', 'post', f'/posts/{post.id}/comment/',
+         {'text': 'Комментарий нагрузочного теста'}, author),
+    ]
+
+
+def percentile(values, percent):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, round(percent / 100 * len(ordered) + 0.5) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def measure(client, method, url, data, iterations, warmup):
+    """Выполняет запросы и собирает метрики сценария."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = size = status = 0
+    for number in range(warmup + iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            content = (
+                b''.join(response.streaming_content)
+                if response.streaming else response.content
+            )
+            elapsed = time.perf_counter() - started
+        if number >= warmup:
+            timings.append(elapsed * 1000)
+            queries = len(captured)
+            size = len(content)
+            status = response.status_code
+    return {
+        'status': status,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'queries': queries,
+        'bytes': size,
+    }
+
+
+def run(iterations, warmup):
+    """Прогоняет все сценарии."""
+    from django.test import Client
+
+    results = {}
+    for name, method, url, data, user in get_scenarios():
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        results[name] = measure(client, method, url, data, iterations,
+                                warmup)
+        print(format_row(name, results[name]), flush=True)
+    return results
+
+
+def format_row(name, result):
+    return (
+        f'{name:<18}{result["status"]:>5}{result["p50_ms"]:>10.2f}'
+        f'{result["p95_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+        f'{result["queries"]:>9}{result["bytes"]:>10}'
+    )
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """
+    Сравнивает прогон с эталоном.
+
+    Returns:
+        list: Описания регрессий
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: SQL-запросов {result["queries"]} '
+                f'вместо {expected["queries"]}'
+            )
+        # Абсолютный порог отсекает шум на запросах в единицы миллисекунд
+        limit = max(expected['p95_ms'] * (1 + threshold),
+                    expected['p95_ms'] + min_delta_ms)
+        if result['p95_ms'] > limit:
+            regressions.append(
+                f'{name}: p95 {result["p95_ms"]} мс '
+                f'при эталоне {expected["p95_ms"]} мс'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=tuple(SIZES),
+                        default='1k')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Допустимый рост p95 относительно эталона.')
+    parser.add_argument('--min-delta-ms', type=float, default=10.0,
+                        help='Рост p95 меньше этого не считается регрессией.')
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    dataset = prepare_dataset(args.size, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / dataset.name
+        shutil.copyfile(dataset, database)
+        use_database(database)
+        print(f'{"сценарий":<18}{"код":>5}{"p50, мс":>10}{"p95, мс":>10}'
+              f'{"p99, мс":>10}{"запросов":>9}{"байт":>10}')
+        results = run(args.iterations, args.warmup)
+
+    baseline_path = BASELINES_DIR / f'{args.size}.json'
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+        )
+        print(f'Эталон сохранён в {baseline_path}')
+        return
+    if not baseline_path.exists():
+        return
+    regressions = compare(results, json.loads(baseline_path.read_text()),
+                          args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        print(f'РЕГРЕССИЯ {regression}')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
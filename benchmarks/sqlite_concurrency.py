@@ -0,0 +1,153 @@
+"""Нагрузочный тест конкурентных чтений и записей в SQLite.
+
+Сравнивает настройки SQLite по умолчанию с профилем production из
+blogicum/sqlite.py: несколько потоков читают ленту, несколько пишут
+комментарии. Для каждого профиля печатается число операций в секунду и
+число ошибок «database is locked».
+
+Запуск:
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 4
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                    'blogicum')
+)
+
+from blogicum.sqlite import get_pragmas  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT, text TEXT);
+CREATE TABLE comment (
+    id INTEGER PRIMARY KEY, post_id INTEGER, text TEXT, created_at REAL
+);
+CREATE INDEX comment_post_idx ON comment (post_id, created_at);
+"""
+
+
+def connect(path, profile):
+    """Соединение с настройками профиля, как у Django."""
+    pragmas = get_pragmas(profile)
+    timeout = pragmas.get('busy_timeout', 5000) / 1000
+    connection = sqlite3.connect(
+        path, timeout=timeout, isolation_level=None,
+        check_same_thread=False
+    )
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name}={value}')
+    return connection
+
+
+def prepare(path, posts):
+    """Создаёт базу с постами и комментариями."""
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.executemany(
+        'INSERT INTO post (id, title, text) VALUES (?, ?, ?)',
+        ((pk, f'Пост {pk}', 'Текст ' * 50) for pk in range(1, posts + 1))
+    )
+    connection.commit()
+    connection.close()
+
+
+def reader(path, profile, posts, deadline, stats):
+    connection = connect(path, profile)
+    operations = errors = 0
+    pk = 0
+    while time.monotonic() < deadline:
+        pk = pk % posts + 1
+        try:
+            connection.execute('SELECT id, title, text FROM post '
+                               'ORDER BY id DESC LIMIT 10').fetchall()
+            connection.execute('SELECT * FROM comment WHERE post_id = ? '
+                               'ORDER BY created_at', (pk,)).fetchall()
+            operations += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    connection.close()
+    stats.append(('read', operations, errors))
+
+
+def writer(path, profile, posts, deadline, stats):
+    connection = connect(path, profile)
+    begin = 'BEGIN IMMEDIATE' if get_pragmas(profile) else 'BEGIN'
+    operations = errors = 0
+    pk = 0
+    while time.monotonic() < deadline:
+        pk = pk % posts + 1
+        try:
+            connection.execute(begin)
+            # Как ORM: сначала проверка поста, затем вставка
+            connection.execute('SELECT id FROM post WHERE id = ?', (pk,))
+            connection.execute(
+                'INSERT INTO comment (post_id, text, created_at) '
+                'VALUES (?, ?, ?)', (pk, 'Комментарий', time.time())
+            )
+            connection.execute('COMMIT')
+            operations += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+    connection.close()
+    stats.append(('write', operations, errors))
+
+
+def run(profile, readers, writers, duration, posts):
+    """Нагрузка на профиль; возвращает сводку по чтениям и записям."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        prepare(path, posts)
+        stats = []
+        deadline = time.monotonic() + duration
+        threads = [
+            threading.Thread(target=reader,
+                             args=(path, profile, posts, deadline, stats))
+            for _ in range(readers)
+        ] + [
+            threading.Thread(target=writer,
+                             args=(path, profile, posts, deadline, stats))
+            for _ in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    summary = {}
+    for kind in ('read', 'write'):
+        operations = sum(row[1] for row in stats if row[0] == kind)
+        errors = sum(row[2] for row in stats if row[0] == kind)
+        summary[kind] = (operations / duration, errors)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--profiles', nargs='+',
+                        default=['default', 'production'])
+    args = parser.parse_args()
+    print(f'{"профиль":<12}{"чтений/с":>12}{"ошибок":>8}'
+          f'{"записей/с":>12}{"ошибок":>8}')
+    for profile in args.profiles:
+        summary = run(profile, args.readers, args.writers, args.duration,
+                      args.posts)
+        (reads, read_errors), (writes, write_errors) = (
+            summary['read'], summary['write']
+        )
+        print(f'{profile:<12}{reads:>12.0f}{read_errors:>8}'
+              f'{writes:>12.0f}{write_errors:>8}')
+
+
+if __name__ == '__main__':
+    main()
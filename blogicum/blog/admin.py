@@ -1,11 +1,97 @@
 """Административный интерфейс для приложения blog."""
-from django.contrib import admin
+from functools import reduce
+from operator import or_
 
-from .models import Category, Comment, Location, Post
+from django.contrib import admin, messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.db.models import Q
+
+from .bulk import set_published
+from .deletion import delete_post, delete_user
+from .models import Category, Comment, DeletionJob, Location, Post
+from .paginators import EstimatedCountPaginator
+
+User = get_user_model()
+
+# Символ, больший любого другого: верхняя граница диапазона по префиксу
+MAX_CHAR = '\U0010ffff'
+
+
+class PublishActionsMixin:
+    """Массовые действия публикации и снятия с публикации."""
+
+    actions = ('publish_selected', 'unpublish_selected')
+
+    @admin.action(description='Опубликовать выбранные объекты')
+    def publish_selected(self, request, queryset):
+        changed = set_published(queryset, True)
+        self.message_user(
+            request, f'Опубликовано объектов: {changed}.', messages.SUCCESS
+        )
+
+    @admin.action(description='Снять с публикации выбранные объекты')
+    def unpublish_selected(self, request, queryset):
+        changed = set_published(queryset, False)
+        self.message_user(
+            request, f'Снято с публикации объектов: {changed}.',
+            messages.SUCCESS
+        )
+
+
+class PrefixAutocompleteMixin:
+    """
+    Поиск для виджетов автодополнения по префиксу индексированного поля.
+
+    Обычный поиск админки строит LIKE '%...%' по всем search_fields и
+    просматривает таблицу целиком. Для запросов автодополнения поле
+    autocomplete_prefix_field сравнивается с диапазоном
+    [префикс, префикс + MAX_CHAR), который SQLite выбирает по индексу.
+    """
+
+    autocomplete_prefix_field = None
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        resolver_match = request.resolver_match
+        if not (
+            search_term
+            and resolver_match
+            and resolver_match.url_name == 'autocomplete'
+        ):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        field = self.autocomplete_prefix_field
+        variants = {
+            search_term, search_term.lower(), search_term.capitalize()
+        }
+        return queryset.filter(reduce(or_, (
+            Q(**{f'{field}__gte': variant, f'{field}__lt': variant + MAX_CHAR})
+            for variant in variants
+        ))), False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(PrefixAutocompleteMixin, UserAdmin):
+    """Административный интерфейс пользователей с быстрым поиском."""
+
+    autocomplete_prefix_field = 'username'
+
+    def delete_model(self, request, obj):
+        delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            delete_user(user)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(PrefixAutocompleteMixin, PublishActionsMixin,
+                admin.ModelAdmin):
     """Административный интерфейс для модели Post."""
 
     list_display = ('title', 'author', 'pub_date', 'category', 'is_published')
@@ -13,10 +99,22 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category', 'is_published', 'pub_date')
     search_fields = ('title', 'text')
     list_per_page = 20
+    list_select_related = ('author', 'category')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ('author', 'category', 'location')
+    autocomplete_prefix_field = 'title'
+
+    def delete_model(self, request, obj):
+        delete_post(obj)
+
+    def delete_queryset(self, request, queryset):
+        for post in queryset:
+            delete_post(post)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PublishActionsMixin, admin.ModelAdmin):
     """Административный интерфейс для модели Category."""
 
     list_display = ('title', 'slug', 'is_published')
@@ -27,7 +125,7 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(PublishActionsMixin, admin.ModelAdmin):
     """Административный интерфейс для модели Location."""
 
     list_display = ('name', 'is_published')
@@ -37,7 +135,7 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PublishActionsMixin, admin.ModelAdmin):
     """Административный интерфейс для модели Comment."""
 
     list_display = ('author', 'post', 'created_at', 'is_published')
@@ -45,3 +143,22 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = ('is_published', 'created_at')
     search_fields = ('text', 'author__username', 'post__title')
     list_per_page = 20
+    list_select_related = ('author', 'post')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ('author', 'post')
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    """Административный интерфейс для просмотра задач удаления."""
+
+    list_display = ('__str__', 'status', 'deleted', 'total', 'created_at',
+                    'finished_at')
+    list_filter = ('status', 'target')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,78 @@
+"""Курсорная пагинация по паре (дата, id)."""
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from ..constants import API_MAX_PAGE_SIZE, API_PAGE_SIZE
+
+
+def encode_cursor(date, pk):
+    """Кодирует позицию последней выданной записи."""
+    raw = f'{date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Декодирует курсор.
+
+    Raises:
+        ValueError: Если курсор повреждён
+    """
+    try:
+        date, pk = base64.urlsafe_b64decode(cursor).decode().split('|')
+        date = parse_datetime(date)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Некорректный курсор')
+    if date is None:
+        raise ValueError('Некорректный курсор')
+    return date, pk
+
+
+def get_page_size(request):
+    """
+    Размер страницы из параметра limit.
+
+    Raises:
+        ValueError: Если limit не является положительным числом
+    """
+    limit = int(request.GET.get('limit', API_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError('limit должен быть положительным')
+    return min(limit, API_MAX_PAGE_SIZE)
+
+
+def paginate(request, queryset, date_field, descending=True):
+    """
+    Возвращает страницу строк queryset и курсор следующей страницы.
+
+    Queryset должен выбирать поля date_field и id. Записи
+    упорядочиваются по (date_field, id), что даёт устойчивый порядок
+    и позволяет продолжить выдачу без OFFSET.
+
+    Raises:
+        ValueError: Если параметры пагинации некорректны
+    """
+    page_size = get_page_size(request)
+    direction = '-' if descending else ''
+    lookup = 'lt' if descending else 'gt'
+    queryset = queryset.order_by(f'{direction}{date_field}', f'{direction}id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        date, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__{lookup}': date})
+            | Q(**{date_field: date, f'id__{lookup}': pk})
+        )
+    rows = list(queryset[:page_size + 1])
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(rows[-1][date_field], rows[-1]['id'])
+        next_url = request.build_absolute_uri(
+            f'{request.path}?{params.urlencode()}'
+        )
+    return rows, next_url
@@ -0,0 +1,78 @@
+"""Сериализация постов, категорий и комментариев из словарей values()."""
+from django.core.files.storage import default_storage
+
+# Поле ответа -> поля, выбираемые из базы через values()
+POST_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'text': ('text',),
+    'pub_date': ('pub_date',),
+    'author': ('author__username',),
+    'category': ('category__slug',),
+    'location': ('location__name', 'location__is_published'),
+    'image': ('image',),
+    'comment_count': ('comment_count',),
+}
+DEFAULT_POST_FIELDS = tuple(field for field in POST_FIELDS if field != 'text')
+
+CATEGORY_FIELDS = ('slug', 'title', 'description')
+
+COMMENT_FIELDS = ('id', 'text', 'created_at', 'author__username')
+
+
+def parse_post_fields(fields_param):
+    """
+    Разбирает параметр fields запроса.
+
+    Returns:
+        tuple: Запрошенные поля ответа
+
+    Raises:
+        ValueError: Если запрошено неизвестное поле
+    """
+    if not fields_param:
+        return DEFAULT_POST_FIELDS
+    fields = tuple(dict.fromkeys(
+        field.strip() for field in fields_param.split(',') if field.strip()
+    ))
+    unknown = set(fields) - set(POST_FIELDS)
+    if unknown:
+        raise ValueError(
+            'Неизвестные поля: ' + ', '.join(sorted(unknown))
+        )
+    return fields
+
+
+def get_post_columns(fields):
+    """Поля для values(), нужные для сериализации запрошенных полей."""
+    return tuple(dict.fromkeys(
+        column for field in fields for column in POST_FIELDS[field]
+    ))
+
+
+def serialize_post(row, fields):
+    """Превращает строку values() в словарь ответа."""
+    data = {}
+    for field in fields:
+        if field == 'location':
+            data[field] = (
+                row['location__name'] if row['location__is_published']
+                else None
+            )
+        elif field == 'image':
+            data[field] = (
+                default_storage.url(row['image']) if row['image'] else None
+            )
+        else:
+            data[field] = row[POST_FIELDS[field][0]]
+    return data
+
+
+def serialize_comment(row):
+    """Превращает строку values() комментария в словарь ответа."""
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'created_at': row['created_at'],
+        'author': row['author__username'],
+    }
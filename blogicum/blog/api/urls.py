@@ -0,0 +1,16 @@
+"""URL-маршруты JSON API."""
+
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.post_list, name='post_list'),
+    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.post_comments, name='post_comments'),
+    path('categories/', views.category_list, name='category_list'),
+    path('users/<str:username>/posts/', views.user_posts, name='user_posts'),
+]
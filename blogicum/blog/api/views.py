@@ -0,0 +1,147 @@
+"""Представления JSON API только для чтения."""
+import hashlib
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from ..models import Category, Comment, Post
+from ..search import search
+from ..services import filter_visible_posts
+from .pagination import paginate
+from .serializers import (CATEGORY_FIELDS, COMMENT_FIELDS, get_post_columns,
+                          parse_post_fields, serialize_comment,
+                          serialize_post)
+
+User = get_user_model()
+
+
+def api_response(request, data, status=HTTPStatus.OK):
+    """
+    JSON-ответ с ETag по содержимому.
+
+    Если клиент прислал совпадающий If-None-Match, тело не отправляется.
+    """
+    response = JsonResponse(data, status=status)
+    if status != HTTPStatus.OK:
+        return response
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def error_response(request, message, status=HTTPStatus.BAD_REQUEST):
+    """JSON-ответ с описанием ошибки."""
+    return api_response(request, {'detail': message}, status=status)
+
+
+def not_found(request):
+    """JSON-ответ 404."""
+    return error_response(request, 'Не найдено.', HTTPStatus.NOT_FOUND)
+
+
+def post_list_response(request, queryset):
+    """Страница постов queryset с учётом параметров fields и cursor."""
+    try:
+        fields = parse_post_fields(request.GET.get('fields'))
+    except ValueError as error:
+        return error_response(request, str(error))
+    if 'comment_count' in fields:
+        queryset = queryset.annotate(comment_count=Count('comments'))
+    columns = get_post_columns(fields)
+    queryset = queryset.values(*dict.fromkeys(('id', 'pub_date', *columns)))
+    try:
+        rows, next_url = paginate(request, queryset, 'pub_date')
+    except ValueError as error:
+        return error_response(request, str(error))
+    return api_response(request, {
+        'results': [serialize_post(row, fields) for row in rows],
+        'next': next_url,
+    })
+
+
+def get_readable_posts(request, queryset):
+    """Посты queryset, которые может видеть текущий пользователь."""
+    visible = filter_visible_posts(queryset)
+    if request.user.is_authenticated:
+        return queryset.filter(author=request.user) | visible
+    return visible
+
+
+@require_safe
+def post_list(request):
+    """Лента опубликованных постов; параметр q включает поиск."""
+    queryset = filter_visible_posts(Post.objects.all())
+    query = request.GET.get('q', '').strip()
+    if query:
+        queryset = search(queryset, query)
+    return post_list_response(request, queryset)
+
+
+@require_safe
+def post_detail(request, post_id):
+    """Пост целиком; неопубликованный виден только автору."""
+    try:
+        fields = parse_post_fields(request.GET.get('fields'))
+    except ValueError as error:
+        return error_response(request, str(error))
+    if not request.GET.get('fields'):
+        fields += ('text',)
+    queryset = get_readable_posts(request, Post.objects.filter(pk=post_id))
+    if 'comment_count' in fields:
+        queryset = queryset.annotate(comment_count=Count('comments'))
+    row = queryset.values(*get_post_columns(fields)).first()
+    if row is None:
+        return not_found(request)
+    return api_response(request, serialize_post(row, fields))
+
+
+@require_safe
+def post_comments(request, post_id):
+    """Комментарии к посту в порядке добавления."""
+    post = get_readable_posts(
+        request, Post.objects.filter(pk=post_id)
+    ).values('pk').first()
+    if post is None:
+        return not_found(request)
+    queryset = Comment.objects.filter(
+        post_id=post_id
+    ).values(*COMMENT_FIELDS)
+    try:
+        rows, next_url = paginate(
+            request, queryset, 'created_at', descending=False
+        )
+    except ValueError as error:
+        return error_response(request, str(error))
+    return api_response(request, {
+        'results': [serialize_comment(row) for row in rows],
+        'next': next_url,
+    })
+
+
+@require_safe
+def category_list(request):
+    """Опубликованные категории."""
+    categories = Category.objects.filter(
+        is_published=True
+    ).order_by('title').values(*CATEGORY_FIELDS)
+    return api_response(request, {'results': list(categories)})
+
+
+@require_safe
+def user_posts(request, username):
+    """Посты пользователя; автору видны и неопубликованные."""
+    user = User.objects.filter(username=username).values('pk').first()
+    if user is None:
+        return not_found(request)
+    queryset = Post.objects.filter(author_id=user['pk'])
+    if request.user.pk != user['pk']:
+        queryset = filter_visible_posts(queryset)
+    return post_list_response(request, queryset)
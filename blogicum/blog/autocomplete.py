@@ -0,0 +1,351 @@
+"""Префиксный индекс для автодополнения заголовков и имён пользователей.
+
+Индекс живёт в памяти процесса и обновляется по сигналам моделей.
+Каждое изменение увеличивает версию в общем кэше и записывается в
+журнал под ключом этой версии; сама запись индекс не трогает. Процесс,
+при чтении заметив новую версию, применяет недостающие изменения к
+копии своего индекса и подменяет индекс целиком, так что читатели
+никогда не видят его недостроенным. Если изменения какой-то версии в
+журнале нет (например, версию увеличила массовая операция), индекс
+перестраивается по базе в фоновом потоке.
+
+Полный снимок индекса кладётся в кэш только после перестройки: с него
+начинают новые процессы. Версия, журнал и снимок доходят до других
+процессов, только если кэш общий для них (см. CACHES).
+"""
+import threading
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+
+from blogicum.routing import read_from_primary
+
+from .caching import bump_version, get_version
+from .constants import (AUTOCOMPLETE_COMPACT_THRESHOLD,
+                        AUTOCOMPLETE_DELTA_TIMEOUT, AUTOCOMPLETE_MAX_DELTAS)
+from .models import Category, Post
+
+User = get_user_model()
+
+NAMESPACE = 'autocomplete'
+SNAPSHOT_KEY = 'blog:autocomplete:snapshot'
+DELTA_KEY = 'blog:autocomplete:delta:{}'
+
+POST = 'post'
+CATEGORY = 'category'
+USER = 'user'
+
+
+def normalize(text):
+    """Приводит строку к виду, в котором хранятся ключи индекса."""
+    return ' '.join(text.lower().replace('ё', 'е').split())
+
+
+def get_keys(label):
+    """Ключи метки: она сама и её хвосты, начинающиеся с каждого слова."""
+    label_key = normalize(label)
+    return {
+        label_key[position:]
+        for position in range(len(label_key))
+        if position == 0 or label_key[position - 1] == ' '
+    }
+
+
+def iter_prefix(keys, prefix):
+    """Записи отсортированного списка, ключ которых начинается с prefix."""
+    position = bisect_left(keys, (prefix,))
+    while position < len(keys) and keys[position][0].startswith(prefix):
+        yield keys[position]
+        position += 1
+
+
+class PrefixIndex:
+    """
+    Отсортированный список ключей с поиском по префиксу через bisect.
+
+    Основной список после постройки не меняется: изменения копятся в
+    небольшом отсортированном довеске, а объекты, которых они касаются,
+    в основном списке пропускаются. Поэтому копия индекса разделяет
+    основной список с оригиналом и обходится дёшево.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._items = {}
+        self._added = []
+        # Объекты, изменённые после постройки; None — удалённый объект
+        self._changed = {}
+
+    @classmethod
+    def build(cls, items):
+        """
+        Строит индекс из объектов, сортируя ключи один раз.
+
+        Args:
+            items: Кортежи (тип, первичный ключ, метка, данные)
+        """
+        index = cls()
+        for kind, pk, label, extra in items:
+            keys = get_keys(label)
+            index._keys.extend((key, kind, pk) for key in keys)
+            index._items[kind, pk] = (label, keys, extra)
+        index._keys.sort()
+        return index
+
+    def _get(self, item_id):
+        if item_id in self._changed:
+            return self._changed[item_id]
+        return self._items.get(item_id)
+
+    def __contains__(self, item_id):
+        return self._get(item_id) is not None
+
+    def copy(self):
+        """
+        Независимая копия индекса.
+
+        Копируются только изменения; если их больше
+        AUTOCOMPLETE_COMPACT_THRESHOLD, они сливаются в новый основной
+        список.
+        """
+        index = PrefixIndex()
+        if len(self._changed) > AUTOCOMPLETE_COMPACT_THRESHOLD:
+            index._keys = sorted(chain(self._iter_base(self._keys),
+                                       self._added))
+            index._items = {
+                item_id: item for item_id, item in chain(
+                    self._items.items(), self._changed.items()
+                )
+                if item is not None and self._get(item_id) is item
+            }
+        else:
+            index._keys = self._keys
+            index._items = self._items
+            index._added = self._added.copy()
+            index._changed = self._changed.copy()
+        return index
+
+    def add(self, kind, pk, label, **extra):
+        """Добавляет объект; каждое слово метки становится ключом."""
+        self.remove(kind, pk)
+        keys = get_keys(label)
+        for key in keys:
+            insort(self._added, (key, kind, pk))
+        self._changed[kind, pk] = (label, keys, extra)
+
+    def remove(self, kind, pk):
+        """Удаляет объект из индекса, если он там есть."""
+        item = self._get((kind, pk))
+        if item is None:
+            return
+        if (kind, pk) in self._changed:
+            for key in item[1]:
+                position = bisect_left(self._added, (key, kind, pk))
+                del self._added[position]
+        self._changed[kind, pk] = None
+
+    def _iter_base(self, keys):
+        """Записи основного списка, не затронутые изменениями."""
+        for entry in keys:
+            if entry[1:] not in self._changed:
+                yield entry
+
+    def lookup(self, prefix, limit, predicate=None):
+        """Возвращает до limit объектов, метка которых содержит префикс."""
+        prefix = normalize(prefix)
+        found = []
+        seen = set()
+        for _, kind, pk in merge(
+            self._iter_base(iter_prefix(self._keys, prefix)),
+            iter_prefix(self._added, prefix),
+        ):
+            if len(found) >= limit:
+                break
+            if (kind, pk) in seen:
+                continue
+            seen.add((kind, pk))
+            label, _, extra = self._get((kind, pk))
+            if predicate is None or predicate(kind, extra):
+                found.append((kind, pk, label, extra))
+        return found
+
+
+def build_index():
+    """Строит индекс по данным из базы."""
+    categories = (
+        (CATEGORY, pk, title, {'slug': slug})
+        for pk, title, slug in Category.objects.filter(
+            is_published=True
+        ).values_list('pk', 'title', 'slug').iterator()
+    )
+    posts = (
+        (POST, pk, title, {'pub_date': pub_date, 'category_id': category_id})
+        for pk, title, pub_date, category_id in Post.objects.filter(
+            is_published=True
+        ).values_list('pk', 'title', 'pub_date', 'category_id').iterator()
+    )
+    users = (
+        (USER, pk, username, {})
+        for pk, username in User.objects.filter(
+            is_active=True
+        ).values_list('pk', 'username').iterator()
+    )
+    return PrefixIndex.build(chain(categories, posts, users))
+
+
+def apply_deltas(index, version, target):
+    """
+    Применяет к копии индекса изменения версий после version до target.
+
+    Returns:
+        PrefixIndex | None: Новый индекс или None, если журнал неполон
+    """
+    if index is None or version is None or not (
+        0 < target - version <= AUTOCOMPLETE_MAX_DELTAS
+    ):
+        return None
+    keys = [DELTA_KEY.format(number) for number in range(version + 1,
+                                                         target + 1)]
+    deltas = cache.get_many(keys)
+    if len(deltas) != len(keys):
+        return None
+    index = index.copy()
+    for key in keys:
+        kind, pk, label, extra = deltas[key]
+        if label is None:
+            index.remove(kind, pk)
+        else:
+            index.add(kind, pk, label, **extra)
+    return index
+
+
+def load_index(target):
+    """Индекс версии target: из снимка и журнала или по базе."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None:
+        version, index = snapshot
+        if version == target:
+            return index
+        index = apply_deltas(index, version, target)
+        if index is not None:
+            return index
+    # Версия прочитана до чтения базы: изменения, сделанные во время
+    # перестройки, будут применены ещё раз, что безопасно
+    with read_from_primary():
+        index = build_index()
+    cache.set(SNAPSHOT_KEY, (target, index), timeout=None)
+    return index
+
+
+class LocalIndex:
+    """
+    Индекс процесса; при обновлении заменяется целиком.
+
+    Изменения из журнала применяются при чтении. Перестройка по базе
+    или снимку долгая, поэтому идёт в фоновом потоке (если включён
+    BLOG_AUTOCOMPLETE_BUILD_IN_THREAD), а до её конца читатели получают
+    прежний индекс — или пустой, если процесс только запустился.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def get(self):
+        """Индекс текущей версии или прежний, пока идёт перестройка."""
+        target = get_version(NAMESPACE)
+        if self.version != target:
+            with self.lock:
+                if self.version != target and not self.is_building():
+                    self.refresh(target)
+        return PrefixIndex() if self.index is None else self.index
+
+    def is_building(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def refresh(self, target):
+        index = apply_deltas(self.index, self.version, target)
+        if index is not None:
+            self.swap(index, target)
+        elif getattr(settings, 'BLOG_AUTOCOMPLETE_BUILD_IN_THREAD', True):
+            self.thread = threading.Thread(
+                target=self.rebuild, args=(target,),
+                name='autocomplete-index', daemon=True
+            )
+            self.thread.start()
+        else:
+            self.swap(load_index(target), target)
+
+    def rebuild(self, target):
+        try:
+            index = load_index(target)
+            with self.lock:
+                self.swap(index, target)
+        finally:
+            connections.close_all()
+
+    def swap(self, index, version):
+        # Сначала индекс, потом версия: увидевший новую версию получит и
+        # новый индекс
+        self.index = index
+        self.version = version
+
+
+_local_index = LocalIndex()
+
+
+def update_index(kind, pk, label=None, **extra):
+    """
+    Записывает изменение объекта в журнал.
+
+    Процессы, в том числе этот, применят его к своим индексам при
+    следующем чтении.
+
+    Args:
+        kind: Тип объекта: POST, CATEGORY или USER
+        pk: Первичный ключ объекта
+        label: Метка объекта; None удаляет объект из индекса
+        extra: Данные, нужные для проверки видимости и ссылки
+    """
+    version = bump_version(NAMESPACE)
+    cache.set(DELTA_KEY.format(version), (kind, pk, label, extra),
+              timeout=AUTOCOMPLETE_DELTA_TIMEOUT)
+
+
+def get_url(kind, pk, label, extra):
+    """Адрес страницы найденного объекта."""
+    if kind == POST:
+        return reverse('blog:post_detail', args=(pk,))
+    if kind == CATEGORY:
+        return reverse('blog:category_posts', args=(extra['slug'],))
+    return reverse('blog:profile', args=(label,))
+
+
+def suggest(prefix, limit):
+    """Возвращает подсказки для введённого префикса."""
+    index = _local_index.get()
+    now = timezone.now()
+
+    def is_visible(kind, extra):
+        return kind != POST or (
+            extra['pub_date'] <= now
+            and (CATEGORY, extra['category_id']) in index
+        )
+
+    return [
+        {
+            'type': kind,
+            'label': label,
+            'url': get_url(kind, pk, label, extra),
+        }
+        for kind, pk, label, extra in index.lookup(prefix, limit, is_visible)
+    ]
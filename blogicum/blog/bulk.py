@@ -0,0 +1,83 @@
+"""Массовая публикация и снятие с публикации.
+
+Изменения выполняются UPDATE-запросами по пачкам первичных ключей в
+обход save() и сигналов, поэтому кэши и флаг видимости постов
+обновляются здесь один раз на всю операцию.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from . import autocomplete, feeds, lookups, visibility
+from .caching import bump_version
+from .constants import BULK_UPDATE_CHUNK_SIZE
+from .models import Category, Comment, Location, Post
+
+# Модель -> пространства имён кэша, которые зависят от её публикации
+INVALIDATED_NAMESPACES = {
+    Post: (feeds.NAMESPACE, autocomplete.NAMESPACE),
+    Category: (lookups.NAMESPACE, feeds.NAMESPACE, autocomplete.NAMESPACE),
+    Location: (lookups.NAMESPACE,),
+    Comment: (),
+}
+
+
+def iter_pk_chunks(queryset, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    """
+    Перебирает первичные ключи queryset пачками.
+
+    Пачки выбираются по условию pk > последнего ключа, а не курсором,
+    поэтому таблицу можно обновлять между пачками.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        chunk_queryset = queryset
+        if last_pk is not None:
+            chunk_queryset = queryset.filter(pk__gt=last_pk)
+        pks = list(chunk_queryset[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def get_update_values(model, is_published):
+    """Поля для UPDATE, включая производные от is_published."""
+    values = {'is_published': is_published}
+    if model is Post:
+        values['is_visible'] = Exists(Category.objects.filter(
+            pk=OuterRef('category_id'), is_published=True
+        )) if is_published else False
+    return values
+
+
+def set_published(queryset, is_published,
+                  chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    """
+    Публикует или снимает с публикации все объекты queryset.
+
+    Args:
+        queryset: QuerySet постов, комментариев, категорий или
+            местоположений; может охватывать всю таблицу
+        is_published: Новое значение поля is_published
+        chunk_size: Число объектов в одном UPDATE
+
+    Returns:
+        int: Число изменённых объектов
+    """
+    model = queryset.model
+    values = get_update_values(model, is_published)
+    changed = 0
+    queryset = queryset.exclude(is_published=is_published)
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            changed += model.objects.filter(pk__in=pks).update(**values)
+            if model is Category:
+                visibility.sync_category_posts(pks, is_published)
+    if changed:
+        for namespace in INVALIDATED_NAMESPACES[model]:
+            bump_version(namespace)
+            transaction.on_commit(
+                lambda namespace=namespace: bump_version(namespace)
+            )
+    return changed
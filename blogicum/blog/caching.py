@@ -0,0 +1,70 @@
+"""Версионирование данных, закэшированных в памяти процессов.
+
+Версия пространства имён хранится в кэше Django, общем для всех
+рабочих процессов (см. CACHES). Запись в базу увеличивает версию, а
+каждый процесс, заметив новую версию, перечитывает свою локальную
+копию данных.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+from blogicum.routing import read_from_primary
+
+
+def get_version_key(namespace):
+    """Ключ версии пространства имён в общем кэше."""
+    return f'blog:version:{namespace}'
+
+
+def get_initial_version():
+    """
+    Начальная версия для отсутствующего в кэше ключа.
+
+    Берётся из текущего времени, чтобы после очистки или вытеснения
+    ключа версия не совпала с той, что уже запомнили процессы.
+    """
+    return time.time_ns()
+
+
+def get_version(namespace):
+    """Возвращает текущую версию пространства имён."""
+    return cache.get_or_set(
+        get_version_key(namespace), get_initial_version, timeout=None
+    )
+
+
+def bump_version(namespace):
+    """Увеличивает версию пространства имён и возвращает новую."""
+    key = get_version_key(namespace)
+    cache.add(key, get_initial_version(), timeout=None)
+    return cache.incr(key)
+
+
+class VersionedLocalCache:
+    """Значение в памяти процесса, перечитываемое при смене версии."""
+
+    def __init__(self, namespace, loader):
+        self.namespace = namespace
+        self.loader = loader
+        self._version = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Возвращает актуальное значение, при необходимости загружая его."""
+        version = get_version(self.namespace)
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    with read_from_primary():
+                        self._value = self.loader()
+                    self._version = version
+        return self._value
+
+    def set(self, value, version):
+        """Сохраняет значение, уже соответствующее версии."""
+        with self._lock:
+            self._value = value
+            self._version = version
@@ -12,3 +12,54 @@ LAST_NAME_MAX_LENGTH = 150
 # Форматы дат
 DATETIME_FORMAT = '%Y-%m-%d %H:%M'
 DATETIME_FORMAT_HTML = '%Y-%m-%dT%H:%M'
+
+# Поиск
+SEARCH_RESULTS_LIMIT = 200
+SEARCH_INDEX_BATCH_SIZE = 2000
+# Во сколько раз увеличивать выдачу бэкенда, если не хватило видимых
+SEARCH_OVERFETCH_FACTOR = 4
+# Сколько найденных pk проверять одним запросом (лимит параметров SQLite)
+SEARCH_FILTER_BATCH_SIZE = 900
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Автодополнение
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_QUERY_LENGTH = 100
+# Сколько изменений процесс догоняет по журналу, прежде чем перестроить индекс
+AUTOCOMPLETE_MAX_DELTAS = 1000
+AUTOCOMPLETE_DELTA_TIMEOUT = 60 * 60
+# После скольких изменений копия индекса сливает их в основной список
+AUTOCOMPLETE_COMPACT_THRESHOLD = 1000
+
+# JSON API
+API_PAGE_SIZE = 10
+API_MAX_PAGE_SIZE = 100
+
+# Ленты RSS/Atom
+FEED_ITEMS_COUNT = 20
+FEED_DESCRIPTION_WORDS = 50
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Карта сайта
+SITEMAP_LIMIT = 50000
+SITEMAP_ITERATOR_CHUNK_SIZE = 2000
+
+# Массовые операции
+BULK_UPDATE_CHUNK_SIZE = 500
+
+# Административный интерфейс
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+# Фоновое удаление
+DELETION_CHUNK_SIZE = 500
+DELETION_INLINE_LIMIT = 500
+
+# Очередь записи
+WRITE_QUEUE_BATCH_SIZE = 100
+# Сколько запрос ждёт сохранения объекта, секунд
+WRITE_QUEUE_TIMEOUT = 10
+
+# Синтетические данные
+DATASET_BATCH_SIZE = 5_000
+DATASET_TEXT_POOL_SIZE = 500
@@ -0,0 +1,196 @@
+"""Генерация синтетических данных для нагрузочных тестов.
+
+Строки вставляются через bulk_create пачками, каждая в своей
+транзакции; тексты берутся из пулов, заранее сгенерированных Faker, так
+что миллионы строк создаются за минуты. Генерация детерминирована:
+одни и те же параметры и зерно дают одни и те же данные.
+
+bulk_create не отправляет сигналы, поэтому флаг видимости постов
+вычисляется здесь, а кэши и поисковый индекс обновляются один раз в
+конце.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from . import autocomplete, feeds, lookups
+from .caching import bump_version
+from .constants import DATASET_BATCH_SIZE, DATASET_TEXT_POOL_SIZE
+from .models import Category, Comment, Location, Post
+from .search import get_backend
+
+User = get_user_model()
+
+PASSWORD = 'synthetic-password'
+
+
+class DatasetError(Exception):
+    """Данные с такими именами уже есть в базе."""
+
+
+def batched(rows, size):
+    """Делит генератор строк на списки длиной не больше size."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(model, rows, batch_size=DATASET_BATCH_SIZE):
+    """
+    Вставляет объекты пачками, каждую в своей транзакции.
+
+    Returns:
+        list: Первичные ключи вставленных объектов
+    """
+    pks = []
+    for batch in batched(rows, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        pks.extend(obj.pk for obj in batch)
+    return pks
+
+
+def sentence_count(rng, median, maximum):
+    """Длина текста в предложениях: логнормальная, с длинным хвостом."""
+    return min(maximum, max(1, round(rng.lognormvariate(0, 0.8) * median)))
+
+
+def skewed_choice(rng, items, skew):
+    """Элемент списка; при skew > 1 первые выбираются намного чаще."""
+    return items[int(len(items) * rng.random() ** skew)]
+
+
+def generate(posts, users=None, categories=None, locations=50,
+             comments=None, unpublished=0.05, future=0.02, comment_skew=4,
+             prefix='synthetic', seed=0, batch_size=DATASET_BATCH_SIZE,
+             search_index=True):
+    """
+    Добавляет в базу синтетические данные.
+
+    Args:
+        posts: Число постов
+        users: Число пользователей; по умолчанию посты / 50, не меньше 10
+        categories: Число категорий; по умолчанию посты / 5000, не меньше 5
+        locations: Число местоположений
+        comments: Число комментариев; по умолчанию равно числу постов
+        unpublished: Доля снятых с публикации постов, комментариев,
+            категорий и местоположений
+        future: Доля постов с датой публикации в будущем
+        comment_skew: Неравномерность комментариев: при 1 они
+            распределены по постам равномерно, чем больше, тем сильнее
+            сосредоточены на немногих «горячих» постах
+        prefix: Префикс имён пользователей и слагов категорий
+        seed: Зерно генератора случайных чисел
+        batch_size: Число строк в одном INSERT
+        search_index: Перестроить поисковый индекс после вставки
+
+    Returns:
+        dict: Число созданных объектов по моделям
+    """
+    users = users or max(10, posts // 50)
+    categories = categories or max(5, posts // 5_000)
+    comments = posts if comments is None else comments
+    if User.objects.filter(username=f'{prefix}0').exists():
+        raise DatasetError(
+            f'Пользователь {prefix}0 уже есть; выберите другой префикс'
+        )
+
+    rng = random.Random(seed)
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed)
+    now = timezone.now()
+    titles = [
+        fake.sentence(nb_words=rng.randint(2, 8))[:256]
+        for _ in range(DATASET_TEXT_POOL_SIZE)
+    ]
+    texts = [
+        fake.paragraph(nb_sentences=sentence_count(rng, 8, 80))
+        for _ in range(DATASET_TEXT_POOL_SIZE)
+    ]
+    comment_texts = [
+        fake.paragraph(nb_sentences=sentence_count(rng, 2, 15))
+        for _ in range(DATASET_TEXT_POOL_SIZE)
+    ]
+
+    def is_published():
+        return rng.random() >= unpublished
+
+    password = make_password(PASSWORD)
+    user_ids = bulk_insert(User, (
+        User(username=f'{prefix}{number}',
+             email=f'{prefix}{number}@example.com', password=password,
+             first_name=fake.first_name(), last_name=fake.last_name())
+        for number in range(users)
+    ), batch_size)
+    category_objects = [
+        Category(title=f'Категория {number}',
+                 slug=f'{prefix}-category-{number}',
+                 description=rng.choice(comment_texts),
+                 is_published=is_published())
+        for number in range(categories)
+    ]
+    bulk_insert(Category, category_objects, batch_size)
+    category_published = {
+        category.pk: category.is_published for category in category_objects
+    }
+    category_ids = list(category_published)
+    location_ids = bulk_insert(Location, (
+        Location(name=fake.city(), is_published=is_published())
+        for _ in range(locations)
+    ), batch_size)
+
+    def make_post():
+        category_id = rng.choice(category_ids)
+        published = is_published()
+        if rng.random() < future:
+            pub_date = now + timedelta(days=rng.uniform(1, 60))
+        else:
+            pub_date = now - timedelta(days=rng.uniform(0, 3 * 365))
+        return Post(
+            title=rng.choice(titles), text=rng.choice(texts),
+            pub_date=pub_date,
+            # Авторы распределены неравномерно: первые пишут больше
+            author_id=skewed_choice(rng, user_ids, 2),
+            category_id=category_id,
+            location_id=(
+                rng.choice(location_ids)
+                if location_ids and rng.random() < 0.7 else None
+            ),
+            is_published=published,
+            is_visible=published and category_published[category_id],
+        )
+
+    post_ids = bulk_insert(Post, (make_post() for _ in range(posts)),
+                           batch_size)
+    bulk_insert(Comment, (
+        Comment(
+            text=rng.choice(comment_texts),
+            post_id=skewed_choice(rng, post_ids, comment_skew),
+            author_id=skewed_choice(rng, user_ids, 2),
+            is_published=is_published(),
+        )
+        for _ in range(comments if post_ids else 0)
+    ), batch_size)
+
+    for namespace in (lookups.NAMESPACE, feeds.NAMESPACE,
+                      autocomplete.NAMESPACE):
+        bump_version(namespace)
+    if search_index:
+        get_backend().rebuild()
+    return {
+        'users': users,
+        'categories': categories,
+        'locations': locations,
+        'posts': posts,
+        'comments': comments if post_ids else 0,
+    }
@@ -0,0 +1,181 @@
+"""Поэтапное удаление постов и пользователей.
+
+Удаление объекта с небольшим числом связанных записей выполняется сразу.
+Если связанных записей много, объект немедленно скрывается, а записи
+удаляются фоновой задачей DeletionJob пачками в отдельных коротких
+транзакциях, чтобы не блокировать SQLite на всё время удаления.
+
+Пока задача удаляет записи, сигналы удаления не обновляют индекс
+автодополнения и ленты для каждой строки: их версии увеличиваются один
+раз по окончании задачи.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import autocomplete, feeds
+from .bulk import set_published
+from .caching import bump_version
+from .constants import DELETION_CHUNK_SIZE, DELETION_INLINE_LIMIT
+from .models import Comment, DeletionJob, Post
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+def get_steps(target, object_id):
+    """
+    План удаления.
+
+    Returns:
+        tuple: QuerySet'ы связанных записей в порядке удаления и
+            QuerySet самого объекта
+    """
+    if target == DeletionJob.POST:
+        return (
+            [Comment.objects.filter(post_id=object_id)],
+            Post.objects.filter(pk=object_id),
+        )
+    return (
+        [
+            Comment.objects.filter(author_id=object_id),
+            Comment.objects.filter(post__author_id=object_id),
+            Post.objects.filter(author_id=object_id),
+        ],
+        User.objects.filter(pk=object_id),
+    )
+
+
+def is_small(target, object_id):
+    """Связанных записей не больше DELETION_INLINE_LIMIT."""
+    related, _ = get_steps(target, object_id)
+    remaining = DELETION_INLINE_LIMIT
+    for queryset in related:
+        remaining -= queryset[:remaining + 1].count()
+        if remaining < 0:
+            return False
+    return True
+
+
+def delete_post(post):
+    """
+    Удаляет пост с комментариями.
+
+    Returns:
+        DeletionJob | None: Фоновая задача, если удаление отложено
+    """
+    if is_small(DeletionJob.POST, post.pk):
+        post.delete()
+        return None
+    post.is_published = False
+    post.save(update_fields=('is_published', 'is_visible'))
+    return schedule(DeletionJob.POST, post.pk)
+
+
+def delete_user(user):
+    """
+    Удаляет пользователя с его постами и комментариями.
+
+    Returns:
+        DeletionJob | None: Фоновая задача, если удаление отложено
+    """
+    if is_small(DeletionJob.USER, user.pk):
+        user.delete()
+        return None
+    user.is_active = False
+    user.save(update_fields=('is_active',))
+    set_published(Post.objects.filter(author_id=user.pk), False)
+    return schedule(DeletionJob.USER, user.pk)
+
+
+def schedule(target, object_id):
+    """Создаёт задачу удаления и запускает её после фиксации транзакции."""
+    job = DeletionJob.objects.create(target=target, object_id=object_id)
+    if getattr(settings, 'BLOG_DELETION_IN_THREAD', True):
+        transaction.on_commit(lambda: start_worker(job.pk))
+    return job
+
+
+def start_worker(job_id):
+    """Выполняет задачу в фоновом потоке."""
+    threading.Thread(
+        target=run_job, args=(job_id,), name=f'deletion-job-{job_id}',
+        daemon=True
+    ).start()
+
+
+def is_job_running():
+    """Текущий поток выполняет задачу удаления."""
+    return getattr(_state, 'job_running', False)
+
+
+@contextmanager
+def deferred_invalidation():
+    """Откладывает сброс автодополнения и лент до конца задачи."""
+    _state.job_running = True
+    try:
+        yield
+    finally:
+        _state.job_running = False
+        for namespace in (autocomplete.NAMESPACE, feeds.NAMESPACE):
+            bump_version(namespace)
+            transaction.on_commit(
+                lambda namespace=namespace: bump_version(namespace)
+            )
+
+
+def delete_in_chunks(queryset, job_id):
+    """Удаляет записи queryset пачками, отмечая прогресс задачи."""
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:DELETION_CHUNK_SIZE])
+        if not pks:
+            return
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=pks).delete()
+            DeletionJob.objects.filter(pk=job_id).update(
+                deleted=F('deleted') + len(pks)
+            )
+
+
+def run_job(job_id):
+    """
+    Выполняет задачу удаления.
+
+    Задача захватывается атомарной сменой статуса, поэтому её можно
+    безопасно запускать одновременно из потока и из команды.
+    """
+    claimed = DeletionJob.objects.filter(
+        pk=job_id, status__in=(DeletionJob.PENDING, DeletionJob.FAILED)
+    ).update(status=DeletionJob.RUNNING, error='')
+    if not claimed:
+        return
+    job = DeletionJob.objects.get(pk=job_id)
+    related, target = get_steps(job.target, job.object_id)
+    try:
+        DeletionJob.objects.filter(pk=job_id).update(
+            total=job.deleted + sum(queryset.count() for queryset in related)
+        )
+        with deferred_invalidation():
+            for queryset in related:
+                delete_in_chunks(queryset, job_id)
+            target.delete()
+        DeletionJob.objects.filter(pk=job_id).update(
+            status=DeletionJob.DONE, finished_at=timezone.now()
+        )
+    except Exception as error:
+        logger.exception('Ошибка в задаче удаления %s', job_id)
+        DeletionJob.objects.filter(pk=job_id).update(
+            status=DeletionJob.FAILED, error=repr(error)
+        )
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
@@ -0,0 +1,217 @@
+"""RSS- и Atom-ленты публикаций.
+
+Записи ленты сериализуются один раз и хранятся в общем кэше до изменения
+постов, категорий или авторов (см. сигналы) либо до наступления даты
+ближайшей отложенной публикации. Заголовки ETag и Last-Modified берутся
+из того же кэша, поэтому повторный опрос ленты не обращается к базе.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Min
+from django.http import Http404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from blogicum.routing import read_from_primary
+
+from .caching import get_version
+from .constants import (FEED_CACHE_TIMEOUT, FEED_DESCRIPTION_WORDS,
+                        FEED_ITEMS_COUNT)
+from .models import Category, Post
+from .services import filter_and_annotate_posts
+
+User = get_user_model()
+
+NAMESPACE = 'feeds'
+
+
+def serialize_entry(post):
+    """Превращает пост в запись ленты."""
+    return {
+        'title': post.title,
+        'link': reverse('blog:post_detail', args=(post.id,)),
+        'description': Truncator(post.text).words(FEED_DESCRIPTION_WORDS),
+        'pub_date': post.pub_date,
+        'author': post.author.username,
+        'author_link': reverse('blog:profile', args=(post.author.username,)),
+        'category': post.category.title,
+    }
+
+
+def build_payload(kind, key):
+    """Собирает данные ленты из базы."""
+    if kind == 'index':
+        queryset = Post.objects.all()
+        title = 'Блогикум'
+        link = reverse('blog:index')
+        description = 'Новые публикации Блогикума.'
+    elif kind == 'category':
+        category = Category.objects.filter(
+            slug=key, is_published=True
+        ).first()
+        if category is None:
+            return None
+        queryset = category.posts.all()
+        title = f'Блогикум: {category.title}'
+        link = reverse('blog:category_posts', args=(category.slug,))
+        description = category.description
+    else:
+        author = User.objects.filter(username=key).first()
+        if author is None:
+            return None
+        queryset = author.posts.all()
+        title = f'Блогикум: публикации @{author.username}'
+        link = reverse('blog:profile', args=(author.username,))
+        description = f'Публикации пользователя @{author.username}.'
+    now = timezone.now()
+    entries = [
+        serialize_entry(post)
+        for post in filter_and_annotate_posts(queryset)[:FEED_ITEMS_COUNT]
+    ]
+    valid_until = queryset.filter(
+        is_visible=True, pub_date__gt=now
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    return {
+        'title': title,
+        'link': link,
+        'description': description,
+        'entries': entries,
+        'etag': hashlib.md5(
+            repr((title, description, entries)).encode()
+        ).hexdigest(),
+        'last_modified': now,
+        'valid_until': valid_until,
+    }
+
+
+def get_payload(kind, key=''):
+    """
+    Возвращает данные ленты из кэша, при необходимости пересобирая их.
+
+    Returns:
+        dict | None: Данные ленты или None, если объекта ленты нет
+    """
+    cache_key = f'blog:feed:{get_version(NAMESPACE)}:{kind}:{key}'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        payload = cached['payload']
+        if payload is None or payload['valid_until'] is None or (
+            payload['valid_until'] > timezone.now()
+        ):
+            return payload
+    with read_from_primary():
+        payload = build_payload(kind, key)
+    cache.set(cache_key, {'payload': payload}, FEED_CACHE_TIMEOUT)
+    return payload
+
+
+class PostsFeed(Feed):
+    """Лента последних публикаций."""
+
+    kind = 'index'
+    key_kwarg = None
+
+    def get_payload(self, kwargs):
+        key = kwargs[self.key_kwarg] if self.key_kwarg else ''
+        return get_payload(self.kind, key)
+
+    def __call__(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        # Feed ставит Last-Modified по дате последней записи; заменяем его
+        # временем сборки ленты, с которым сравнивает condition().
+        response.headers.pop('Last-Modified', None)
+        return response
+
+    def get_object(self, request, **kwargs):
+        payload = self.get_payload(kwargs)
+        if payload is None:
+            raise Http404('Лента не найдена')
+        return payload
+
+    def title(self, obj):
+        return obj['title']
+
+    def link(self, obj):
+        return obj['link']
+
+    def description(self, obj):
+        return obj['description']
+
+    def subtitle(self, obj):
+        return obj['description']
+
+    def items(self, obj):
+        return obj['entries']
+
+    def item_title(self, item):
+        return item['title']
+
+    def item_description(self, item):
+        return item['description']
+
+    def item_link(self, item):
+        return item['link']
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        return item['author']
+
+    def item_author_link(self, item):
+        return item['author_link']
+
+    def item_categories(self, item):
+        return (item['category'],)
+
+    def as_view(self):
+        """Представление ленты с поддержкой условных запросов."""
+        def etag(request, **kwargs):
+            payload = self.get_payload(kwargs)
+            return payload and payload['etag']
+
+        def last_modified(request, **kwargs):
+            payload = self.get_payload(kwargs)
+            return payload and payload['last_modified']
+
+        return condition(etag_func=etag, last_modified_func=last_modified)(
+            self
+        )
+
+
+class CategoryPostsFeed(PostsFeed):
+    """Лента публикаций категории."""
+
+    kind = 'category'
+    key_kwarg = 'category_slug'
+
+
+class AuthorPostsFeed(PostsFeed):
+    """Лента публикаций автора."""
+
+    kind = 'author'
+    key_kwarg = 'username'
+
+
+class PostsAtomFeed(PostsFeed):
+    """Лента последних публикаций в формате Atom."""
+
+    feed_type = Atom1Feed
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    """Лента публикаций категории в формате Atom."""
+
+    feed_type = Atom1Feed
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    """Лента публикаций автора в формате Atom."""
+
+    feed_type = Atom1Feed
@@ -3,10 +3,74 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 
 from .constants import (DATETIME_FORMAT_HTML, FIRST_NAME_MAX_LENGTH,
                         LAST_NAME_MAX_LENGTH)
-from .models import Comment, Post
+from .lookups import get_lookups
+from .models import Category, Comment, Location, Post
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора из справочников в памяти, без запроса к базе."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in self.field.get_objects():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.get_objects()) + (
+            self.field.empty_label is not None
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            self.field.get_objects()
+        )
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    Выбор опубликованной категории или местоположения.
+
+    Варианты и проверка значения берутся из справочников blog.lookups,
+    которые сбрасываются сигналами при изменении таблиц.
+    """
+
+    iterator = CachedModelChoiceIterator
+
+    # Модель -> атрибут снимка справочников
+    LOOKUP_TABLES = {
+        Category: 'categories',
+        Location: 'locations',
+    }
+
+    def get_objects(self):
+        """Опубликованные объекты справочника в порядке первичного ключа."""
+        table = getattr(get_lookups(), self.LOOKUP_TABLES[self.queryset.model])
+        return [
+            obj for _, obj in sorted(table.items()) if obj.is_published
+        ]
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        table = getattr(get_lookups(), self.LOOKUP_TABLES[self.queryset.model])
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        try:
+            obj = table.get(int(value))
+        except (TypeError, ValueError):
+            obj = None
+        if obj is None or not obj.is_published:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
 
 
 class RegistrationForm(UserCreationForm):
@@ -120,18 +184,25 @@ class PostForm(forms.ModelForm):
                 attrs={'type': 'datetime-local'}
             ),
         }
+        field_classes = {
+            'category': CachedModelChoiceField,
+            'location': CachedModelChoiceField,
+        }
 
     def __init__(self, *args, **kwargs):
-        """Настройка формы."""
         super().__init__(*args, **kwargs)
-        if 'category' in self.fields:
-            self.fields['category'].queryset = self.fields[
-                'category'
-            ].queryset.filter(is_published=True)
-        if 'location' in self.fields:
-            self.fields['location'].queryset = self.fields[
-                'location'
-            ].queryset.filter(is_published=True)
+        # Справочники обновляются при создании формы, а не при её выводе
+        get_lookups()
+
+    def _get_validation_exclusions(self):
+        # Существование категории и местоположения уже проверено по
+        # справочникам; повторная проверка в модели стоила бы запросов.
+        exclude = super()._get_validation_exclusions()
+        exclude.update(
+            name for name, field in self.fields.items()
+            if isinstance(field, CachedModelChoiceField)
+        )
+        return exclude
 
 
 class CommentForm(forms.ModelForm):
@@ -0,0 +1,74 @@
+"""Справочники категорий и местоположений в памяти процесса.
+
+Таблицы категорий и местоположений маленькие и меняются редко, поэтому
+каждый процесс держит их целиком в памяти и перечитывает только после
+смены версии (её увеличивают сигналы при записи). Ленты постов
+подставляют связанные объекты из справочников вместо JOIN.
+"""
+from dataclasses import dataclass
+
+from django.db.models.query import ModelIterable
+
+from .caching import VersionedLocalCache
+from .models import Category, Location, Post
+
+NAMESPACE = 'lookups'
+
+
+@dataclass(frozen=True)
+class Lookups:
+    """Снимок справочников."""
+
+    categories: dict
+    categories_by_slug: dict
+    locations: dict
+
+
+def load_lookups():
+    """Читает справочники из базы."""
+    categories = {category.pk: category for category in Category.objects.all()}
+    return Lookups(
+        categories=categories,
+        categories_by_slug={
+            category.slug: category for category in categories.values()
+        },
+        locations={
+            location.pk: location for location in Location.objects.all()
+        },
+    )
+
+
+_lookups = VersionedLocalCache(NAMESPACE, load_lookups)
+
+
+def get_lookups():
+    """Возвращает актуальный снимок справочников."""
+    return _lookups.get()
+
+
+def get_published_category(slug):
+    """Опубликованная категория по slug или None."""
+    category = get_lookups().categories_by_slug.get(slug)
+    if category is None or not category.is_published:
+        return None
+    return category
+
+
+class CachedLookupsIterable(ModelIterable):
+    """Подставляет в посты категорию и местоположение из справочников."""
+
+    def __iter__(self):
+        lookups = get_lookups()
+        category_field = Post._meta.get_field('category')
+        location_field = Post._meta.get_field('location')
+        for post in super().__iter__():
+            for field, objects in (
+                (category_field, lookups.categories),
+                (location_field, lookups.locations),
+            ):
+                related_id = getattr(post, field.attname)
+                if related_id is None:
+                    field.set_cached_value(post, None)
+                elif related_id in objects:
+                    field.set_cached_value(post, objects[related_id])
+            yield post
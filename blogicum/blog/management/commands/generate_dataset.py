@@ -0,0 +1,82 @@
+"""Команда генерации синтетических данных."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import DATASET_BATCH_SIZE
+from blog.datasets import DatasetError, generate
+
+
+def fraction(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError(value)
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Добавляет в базу синтетических пользователей, категории, '
+        'местоположения, посты и комментарии для нагрузочных тестов. '
+        'Одинаковые параметры и зерно дают одинаковые данные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000,
+                            help='Число постов.')
+        parser.add_argument('--users', type=int,
+                            help='Число пользователей (по умолчанию '
+                                 'посты / 50).')
+        parser.add_argument('--categories', type=int,
+                            help='Число категорий (по умолчанию '
+                                 'посты / 5000).')
+        parser.add_argument('--locations', type=int, default=50,
+                            help='Число местоположений.')
+        parser.add_argument('--comments', type=int,
+                            help='Число комментариев (по умолчанию '
+                                 'равно числу постов).')
+        parser.add_argument('--unpublished', type=fraction, default=0.05,
+                            help='Доля неопубликованных объектов.')
+        parser.add_argument('--future', type=fraction, default=0.02,
+                            help='Доля постов с датой в будущем.')
+        parser.add_argument('--comment-skew', type=float, default=4,
+                            help='Сосредоточенность комментариев на '
+                                 'немногих постах; 1 — равномерно.')
+        parser.add_argument('--prefix', default='synthetic',
+                            help='Префикс имён пользователей и слагов.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генератора случайных чисел.')
+        parser.add_argument('--batch-size', type=int,
+                            default=DATASET_BATCH_SIZE,
+                            help='Число строк в одном INSERT.')
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help='Не перестраивать поисковый индекс.')
+
+    def handle(self, *args, **options):
+        if options['posts'] < 0 or options['batch_size'] < 1:
+            raise CommandError(
+                '--posts не может быть меньше 0, --batch-size — меньше 1.'
+            )
+        started = time.perf_counter()
+        try:
+            created = generate(
+                options['posts'], users=options['users'],
+                categories=options['categories'],
+                locations=options['locations'],
+                comments=options['comments'],
+                unpublished=options['unpublished'],
+                future=options['future'],
+                comment_skew=options['comment_skew'],
+                prefix=options['prefix'], seed=options['seed'],
+                batch_size=options['batch_size'],
+                search_index=not options['skip_search_index'],
+            )
+        except DatasetError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            'Создано: пользователей {users}, категорий {categories}, '
+            'местоположений {locations}, постов {posts}, '
+            'комментариев {comments} за {seconds:.0f} с.'.format(
+                seconds=time.perf_counter() - started, **created
+            )
+        ))
@@ -0,0 +1,73 @@
+"""Команда предварительной генерации файлов карты сайта."""
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Записывает карту сайта (индекс и файлы разделов) в каталог '
+        'для отдачи веб-сервером.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=settings.SITEMAP_ROOT,
+            help='Каталог для файлов карты сайта.'
+        )
+        parser.add_argument(
+            '--base-url', default=settings.SITE_URL,
+            help='Адрес сайта без завершающей косой черты.'
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        base_url = options['base_url'].rstrip('/')
+        index = []
+        for section in sitemaps.SECTIONS:
+            index += self.write_section(output, base_url, section)
+        self.write_file(output / 'sitemap.xml', [sitemaps.render_index(index)])
+        self.stdout.write(self.style.SUCCESS(
+            f'Записано файлов разделов: {len(index)}.'
+        ))
+
+    def write_section(self, output, base_url, section):
+        """
+        Записывает файлы раздела, те же, что отдаёт представление.
+
+        Returns:
+            list: Пары (адрес файла, дата изменения) для индекса
+        """
+        written = []
+        for page in sitemaps.get_pages(section):
+            latest = {}
+            name = sitemaps.get_file_name(section, page)
+            self.write_file(output / name, sitemaps.render_urlset(
+                base_url, self.track_lastmod(
+                    sitemaps.iter_urls(section, page), latest
+                )
+            ))
+            written.append((f'{base_url}/{name}', latest.get('lastmod')))
+        return written
+
+    @staticmethod
+    def track_lastmod(urls, latest):
+        """Пропускает адреса, запоминая самую позднюю дату изменения."""
+        for path, lastmod in urls:
+            previous = latest.get('lastmod')
+            if lastmod and (previous is None or lastmod > previous):
+                latest['lastmod'] = lastmod
+            yield path, lastmod
+
+    @staticmethod
+    def write_file(path, parts):
+        """Записывает файл атомарно: через временный файл и переименование."""
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.writelines(parts)
+        os.replace(temp_path, path)
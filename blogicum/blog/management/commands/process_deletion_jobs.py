@@ -0,0 +1,33 @@
+"""Команда выполнения отложенных задач удаления."""
+from django.core.management.base import BaseCommand
+
+from blog.deletion import run_job
+from blog.models import DeletionJob
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет задачи удаления в очереди и завершившиеся ошибкой, '
+        'например после перезапуска сервера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-running', action='store_true',
+            help='Перезапустить и задачи, оставшиеся в статусе running.'
+        )
+
+    def handle(self, *args, **options):
+        statuses = [DeletionJob.PENDING, DeletionJob.FAILED]
+        if options['include_running']:
+            DeletionJob.objects.filter(status=DeletionJob.RUNNING).update(
+                status=DeletionJob.PENDING
+            )
+        job_ids = list(DeletionJob.objects.filter(
+            status__in=statuses
+        ).values_list('pk', flat=True))
+        for job_id in job_ids:
+            run_job(job_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано задач: {len(job_ids)}.'
+        ))
@@ -0,0 +1,12 @@
+"""Команда полной перестройки поискового индекса."""
+from django.core.management.base import BaseCommand
+
+from blog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций и комментариев.'
+
+    def handle(self, *args, **options):
+        get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
@@ -0,0 +1,17 @@
+"""Команда сверки флага видимости постов."""
+from django.core.management.base import BaseCommand
+
+from blog.visibility import refresh_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает флаг is_visible у постов, где он разошёлся '
+        'с публикацией поста и категории. Запускается периодически.'
+    )
+
+    def handle(self, *args, **options):
+        changed = refresh_visibility()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено постов: {changed}.'
+        ))
@@ -0,0 +1,27 @@
+"""Команда обновления локальных реплик базы."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from blogicum.replication import sync_replicas
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в реплики для чтения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять копирование каждые N секунд.'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            replicas = sync_replicas()
+            self.stdout.write(self.style.SUCCESS(
+                f'Обновлено реплик: {len(replicas)}.'
+            ))
+            if not interval:
+                return
+            time.sleep(interval)
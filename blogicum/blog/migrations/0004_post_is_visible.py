@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def fill_is_visible(apps, schema_editor):
+    Category = apps.get_model("blog", "Category")
+    Post = apps.get_model("blog", "Post")
+    Post.objects.filter(
+        is_published=True,
+        category__in=Category.objects.filter(is_published=True).values("pk"),
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_alter_comment_options_alter_post_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="is_visible",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text=(
+                    "Пост и его категория опубликованы; "
+                    "поддерживается автоматически."
+                ),
+                verbose_name="Виден в ленте",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["is_visible", "-pub_date"],
+                name="post_visible_pub_date_idx",
+            ),
+        ),
+        migrations.RunPython(fill_is_visible, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_post_is_visible"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="title",
+            field=models.CharField(
+                db_index=True,
+                max_length=256,
+                validators=[django.core.validators.MinLengthValidator(3)],
+                verbose_name="Заголовок",
+            ),
+        ),
+    ]
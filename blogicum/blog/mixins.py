@@ -15,14 +15,13 @@ class CommentBaseMixin(LoginRequiredMixin, UserPassesTestMixin):
     pk_url_kwarg = 'comment_id'
 
     def test_func(self):
-        comment = self.get_object()
-        return self.request.user == comment.author
+        self.object = self.get_object()
+        return self.request.user.id == self.object.author_id
 
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
             return super().handle_no_permission()
-        comment = self.get_object()
-        return redirect('blog:post_detail', post_id=comment.post.id)
+        return redirect('blog:post_detail', post_id=self.object.post_id)
 
 
 class CommentDeleteMixin(CommentBaseMixin):
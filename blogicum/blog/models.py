@@ -7,6 +7,9 @@ from .constants import STR_SHORT_LENGTH
 
 User = get_user_model()
 
+# Поля поста, от которых зависит флаг is_visible
+VISIBILITY_FIELDS = frozenset({'is_published', 'category', 'category_id'})
+
 
 class PublishedCreatedModel(models.Model):
     """Абстрактная модель с полями is_published и created_at."""
@@ -57,13 +60,26 @@ class Category(PublishedCreatedModel):
         return self.title[:STR_SHORT_LENGTH]
 
 
+class PostQuerySet(models.QuerySet):
+    """QuerySet постов."""
+
+    def with_cached_lookups(self):
+        """Берёт категорию и местоположение из справочников в памяти."""
+        from .lookups import CachedLookupsIterable
+
+        clone = self._chain()
+        clone._iterable_class = CachedLookupsIterable
+        return clone
+
+
 class Post(PublishedCreatedModel):
     """Модель поста блога."""
 
     title = models.CharField(
         'Заголовок',
         max_length=256,
-        validators=[MinLengthValidator(3)]
+        validators=[MinLengthValidator(3)],
+        db_index=True
     )
     text = models.TextField('Текст')
     pub_date = models.DateTimeField(
@@ -101,14 +117,41 @@ class Post(PublishedCreatedModel):
         null=True
     )
 
+    is_visible = models.BooleanField(
+        'Виден в ленте',
+        default=False,
+        editable=False,
+        help_text=(
+            'Пост и его категория опубликованы; '
+            'поддерживается автоматически.'
+        )
+    )
+
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['is_visible', '-pub_date'],
+                name='post_visible_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, update_fields=None, **kwargs):
+        # Флаг видимости вычисляется в pre_save; при частичном сохранении
+        # его нужно записать вместе с полями, от которых он зависит
+        if update_fields is not None and (
+            VISIBILITY_FIELDS & set(update_fields)
+        ):
+            update_fields = {*update_fields, 'is_visible'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Comment(PublishedCreatedModel):
     """Модель комментария."""
@@ -134,3 +177,47 @@ class Comment(PublishedCreatedModel):
 
     def __str__(self):
         return f'Комментарий от {self.author.username} к посту "{self.post}"'
+
+
+class DeletionJob(models.Model):
+    """Фоновое удаление объекта вместе со связанными записями."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    POST = 'post'
+    USER = 'user'
+    TARGET_CHOICES = (
+        (POST, 'Публикация'),
+        (USER, 'Пользователь'),
+    )
+
+    target = models.CharField('Тип объекта', max_length=16,
+                              choices=TARGET_CHOICES)
+    object_id = models.PositiveBigIntegerField('ID объекта')
+    status = models.CharField('Статус', max_length=16,
+                              choices=STATUS_CHOICES, default=PENDING)
+    total = models.PositiveIntegerField('Всего записей', default=0)
+    deleted = models.PositiveIntegerField('Удалено записей', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'задача удаления'
+        verbose_name_plural = 'Задачи удаления'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status'], name='deletionjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'Удаление {self.get_target_display()} #{self.object_id}'
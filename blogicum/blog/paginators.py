@@ -0,0 +1,29 @@
+"""Пагинаторы для больших таблиц."""
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+from .constants import ESTIMATED_COUNT_THRESHOLD
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, не считающий COUNT(*) по всей большой таблице.
+
+    Для выборки без условий число строк оценивается по максимальному
+    первичному ключу: это один шаг по индексу вместо полного прохода.
+    Оценка завышена на число удалённых строк, поэтому последние
+    страницы могут оказаться пустыми. Для отфильтрованных выборок и
+    небольших таблиц используется точный подсчёт.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = queryset.order_by().aggregate(
+                max_pk=Max('pk')
+            )['max_pk'] or 0
+            if estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
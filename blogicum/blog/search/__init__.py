@@ -0,0 +1,64 @@
+"""Поиск по публикациям и комментариям.
+
+Бэкенд поиска выбирается настройкой ``BLOG_SEARCH_BACKEND``;
+остальной код проекта работает только с функциями этого модуля.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import Case, IntegerField, When
+from django.utils.module_loading import import_string
+
+from ..constants import (SEARCH_FILTER_BATCH_SIZE, SEARCH_OVERFETCH_FACTOR,
+                         SEARCH_RESULTS_LIMIT)
+
+DEFAULT_BACKEND = 'blog.search.database.DatabaseSearchBackend'
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Возвращает экземпляр бэкенда поиска из настроек."""
+    backend_path = getattr(settings, 'BLOG_SEARCH_BACKEND', DEFAULT_BACKEND)
+    return import_string(backend_path)()
+
+
+def search(queryset, query, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Ищет объекты queryset по тексту запроса.
+
+    Бэкенд ничего не знает об условиях queryset (например, о видимости
+    постов), поэтому его выдача проверяется по queryset; если после
+    проверки осталось меньше limit объектов, у бэкенда запрашивается
+    в SEARCH_OVERFETCH_FACTOR раз больше, пока выдача не кончится.
+
+    Args:
+        queryset: QuerySet постов или комментариев
+        query: Строка поискового запроса
+        limit: Максимальное число результатов
+
+    Returns:
+        QuerySet: Найденные объекты в порядке релевантности
+    """
+    backend = get_backend()
+    checked = set()
+    matching = set()
+    fetch = limit
+    while True:
+        pks = backend.search(queryset.model, query, fetch)
+        new_pks = [pk for pk in pks if pk not in checked]
+        checked.update(new_pks)
+        for start in range(0, len(new_pks), SEARCH_FILTER_BATCH_SIZE):
+            matching.update(queryset.filter(
+                pk__in=new_pks[start:start + SEARCH_FILTER_BATCH_SIZE]
+            ).values_list('pk', flat=True))
+        if len(matching) >= limit or len(pks) < fetch:
+            break
+        fetch *= SEARCH_OVERFETCH_FACTOR
+    pks = [pk for pk in pks if pk in matching][:limit]
+    if not pks:
+        return queryset.none()
+    ranking = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(pks)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=pks).order_by(ranking)
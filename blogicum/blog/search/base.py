@@ -0,0 +1,33 @@
+"""Базовый класс бэкендов поиска."""
+from ..models import Comment, Post
+
+# Индексируемые текстовые поля моделей
+SEARCH_FIELDS = {
+    Post: ('title', 'text'),
+    Comment: ('text',),
+}
+
+
+class BaseSearchBackend:
+    """Интерфейс бэкенда поиска."""
+
+    def search(self, model, query, limit):
+        """Возвращает список pk, отсортированный по релевантности."""
+        raise NotImplementedError
+
+    def index(self, instance):
+        """Добавляет или обновляет объект в индексе."""
+
+    def remove(self, model, pk):
+        """Удаляет объект из индекса."""
+
+    def rebuild(self, models=None):
+        """Полностью перестраивает индекс для указанных моделей."""
+
+    @staticmethod
+    def get_document(instance):
+        """Собирает индексируемый текст объекта."""
+        return ' '.join(
+            getattr(instance, field) or ''
+            for field in SEARCH_FIELDS[type(instance)]
+        )
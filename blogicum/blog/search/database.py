@@ -0,0 +1,29 @@
+"""Поиск средствами ORM без отдельного индекса."""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .base import SEARCH_FIELDS, BaseSearchBackend
+from .text import split_words
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Поиск подстрок по всем словам запроса."""
+
+    def search(self, model, query, limit):
+        words = split_words(query)
+        if not words:
+            return []
+        fields = SEARCH_FIELDS[model]
+        queryset = model.objects.all()
+        for word in words:
+            # LIKE в SQLite не учитывает регистр только для ASCII,
+            # поэтому кириллицу ищем в типичных вариантах написания.
+            variants = {word, word.capitalize(), word.upper()}
+            queryset = queryset.filter(reduce(or_, (
+                Q(**{f'{field}__contains': variant})
+                for field in fields
+                for variant in variants
+            )))
+        return list(queryset.values_list('pk', flat=True)[:limit])
@@ -0,0 +1,185 @@
+"""Инвертированный индекс на диске с ранжированием BM25.
+
+Используется там, где SQLite собран без FTS5. Индекс хранится
+в отдельном файле SQLite в виде таблиц без rowid: постинги
+кластеризованы по (вид документа, терм), поэтому выборка по терму —
+один проход по B-дереву.
+"""
+import math
+import sqlite3
+from collections import Counter, defaultdict
+from contextlib import closing
+
+from django.conf import settings
+
+from ..constants import BM25_B, BM25_K1, SEARCH_INDEX_BATCH_SIZE
+from .base import SEARCH_FIELDS, BaseSearchBackend
+from .text import analyze
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    terms TEXT NOT NULL,
+    PRIMARY KEY (kind, doc_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (kind, term, doc_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    kind TEXT PRIMARY KEY,
+    doc_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+"""
+
+# Ограничение SQLite на число параметров в одном запросе
+MAX_QUERY_PARAMS = 900
+
+
+def get_kind(model):
+    """Имя вида документа в индексе."""
+    return model._meta.label_lower
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """Поиск по собственному инвертированному индексу с BM25."""
+
+    def __init__(self, path=None):
+        self.path = str(path or settings.BLOG_SEARCH_INDEX_PATH)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return closing(conn)
+
+    def search(self, model, query, limit):
+        terms = set(analyze(query))
+        if not terms:
+            return []
+        kind = get_kind(model)
+        with self._connect() as conn:
+            stats = conn.execute(
+                'SELECT doc_count, total_length FROM stats WHERE kind = ?',
+                (kind,)
+            ).fetchone()
+            if not stats or not stats[0]:
+                return []
+            doc_count, total_length = stats
+            postings = {
+                term: conn.execute(
+                    'SELECT doc_id, tf FROM postings '
+                    'WHERE kind = ? AND term = ?',
+                    (kind, term)
+                ).fetchall()
+                for term in terms
+            }
+            doc_ids = {doc_id for rows in postings.values()
+                       for doc_id, _ in rows}
+            lengths = self._get_lengths(conn, kind, doc_ids)
+        avg_length = total_length / doc_count
+        scores = defaultdict(float)
+        for rows in postings.values():
+            df = len(rows)
+            if not df:
+                continue
+            idf = math.log((doc_count - df + 0.5) / (df + 0.5) + 1)
+            for doc_id, tf in rows:
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * lengths[doc_id] / avg_length
+                )
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], -doc_id))
+        return ranked[:limit]
+
+    @staticmethod
+    def _get_lengths(conn, kind, doc_ids):
+        doc_ids = list(doc_ids)
+        lengths = {}
+        for start in range(0, len(doc_ids), MAX_QUERY_PARAMS):
+            chunk = doc_ids[start:start + MAX_QUERY_PARAMS]
+            placeholders = ', '.join('?' * len(chunk))
+            lengths.update(conn.execute(
+                'SELECT doc_id, length FROM documents '
+                f'WHERE kind = ? AND doc_id IN ({placeholders})',
+                (kind, *chunk)
+            ))
+        return lengths
+
+    def index(self, instance):
+        kind = get_kind(type(instance))
+        terms = analyze(self.get_document(instance))
+        with self._connect() as conn, conn:
+            self._remove(conn, kind, instance.pk)
+            self._add(conn, kind, instance.pk, terms)
+
+    def remove(self, model, pk):
+        with self._connect() as conn, conn:
+            self._remove(conn, get_kind(model), pk)
+
+    def rebuild(self, models=None):
+        with self._connect() as conn, conn:
+            for model in models or SEARCH_FIELDS:
+                kind = get_kind(model)
+                for table in ('documents', 'postings', 'stats'):
+                    conn.execute(
+                        f'DELETE FROM {table} WHERE kind = ?', (kind,)
+                    )
+                documents = model.objects.values_list(
+                    'pk', *SEARCH_FIELDS[model]
+                ).iterator(chunk_size=SEARCH_INDEX_BATCH_SIZE)
+                for pk, *texts in documents:
+                    terms = analyze(' '.join(text or '' for text in texts))
+                    self._add(conn, kind, pk, terms)
+
+    @staticmethod
+    def _add(conn, kind, doc_id, terms):
+        frequencies = Counter(terms)
+        conn.execute(
+            'INSERT INTO documents (kind, doc_id, length, terms) '
+            'VALUES (?, ?, ?, ?)',
+            (kind, doc_id, len(terms), ' '.join(frequencies))
+        )
+        conn.executemany(
+            'INSERT INTO postings (kind, term, doc_id, tf) '
+            'VALUES (?, ?, ?, ?)',
+            [(kind, term, doc_id, tf) for term, tf in frequencies.items()]
+        )
+        conn.execute(
+            'INSERT INTO stats (kind, doc_count, total_length) '
+            'VALUES (?, 1, ?) ON CONFLICT (kind) DO UPDATE SET '
+            'doc_count = doc_count + 1, '
+            'total_length = total_length + excluded.total_length',
+            (kind, len(terms))
+        )
+
+    @staticmethod
+    def _remove(conn, kind, doc_id):
+        row = conn.execute(
+            'SELECT length, terms FROM documents '
+            'WHERE kind = ? AND doc_id = ?',
+            (kind, doc_id)
+        ).fetchone()
+        if row is None:
+            return
+        length, terms = row
+        conn.executemany(
+            'DELETE FROM postings WHERE kind = ? AND term = ? AND doc_id = ?',
+            [(kind, term, doc_id) for term in terms.split()]
+        )
+        conn.execute(
+            'DELETE FROM documents WHERE kind = ? AND doc_id = ?',
+            (kind, doc_id)
+        )
+        conn.execute(
+            'UPDATE stats SET doc_count = doc_count - 1, '
+            'total_length = total_length - ? WHERE kind = ?',
+            (length, kind)
+        )
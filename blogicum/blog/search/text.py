@@ -0,0 +1,45 @@
+"""Разбиение текста на термы для поискового индекса."""
+import re
+import threading
+
+import snowballstemmer
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+CYRILLIC_RE = re.compile(r'[а-я]')
+
+STOP_WORDS = frozenset((
+    'а', 'без', 'бы', 'в', 'во', 'вот', 'да', 'для', 'до', 'его', 'ее',
+    'если', 'же', 'за', 'и', 'из', 'или', 'им', 'их', 'к', 'как', 'ко',
+    'ли', 'на', 'над', 'не', 'нет', 'ни', 'но', 'о', 'об', 'от', 'по',
+    'под', 'при', 'про', 'с', 'со', 'так', 'то', 'у', 'уже', 'что', 'это',
+    'a', 'an', 'and', 'in', 'is', 'of', 'on', 'or', 'the', 'to',
+))
+
+# Стеммеры snowballstemmer хранят состояние, поэтому у каждого потока свои
+_local = threading.local()
+
+
+def _get_stemmers():
+    if not hasattr(_local, 'stemmers'):
+        _local.stemmers = {
+            'russian': snowballstemmer.stemmer('russian'),
+            'english': snowballstemmer.stemmer('english'),
+        }
+    return _local.stemmers
+
+
+def split_words(text):
+    """Возвращает слова текста в нижнем регистре с заменой «ё» на «е»."""
+    return WORD_RE.findall(text.lower().replace('ё', 'е'))
+
+
+def analyze(text):
+    """Превращает текст в список термов: слова без стоп-слов, со стеммингом."""
+    stemmers = _get_stemmers()
+    terms = []
+    for word in split_words(text):
+        if word in STOP_WORDS:
+            continue
+        language = 'russian' if CYRILLIC_RE.search(word) else 'english'
+        terms.append(stemmers[language].stemWord(word))
+    return terms
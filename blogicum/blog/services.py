@@ -11,7 +11,15 @@ def get_paginated_page(request, queryset, per_page=POSTS_PER_PAGE):
     """Возвращает пагинированную страницу для queryset."""
     paginator = Paginator(queryset, per_page)
     page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    page = paginator.get_page(page_number)
+    # Посты страницы загружаются здесь, а не при рендеринге шаблона
+    page.object_list = list(page.object_list)
+    return page
+
+
+def filter_visible_posts(queryset):
+    """Оставляет только посты, видимые всем пользователям."""
+    return queryset.filter(is_visible=True, pub_date__lte=timezone.now())
 
 
 def filter_and_annotate_posts(queryset, filter_published=True):
@@ -26,13 +34,9 @@ def filter_and_annotate_posts(queryset, filter_published=True):
         QuerySet: Обработанный QuerySet
     """
     if filter_published:
-        queryset = queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
-        )
+        queryset = filter_visible_posts(queryset)
 
-    queryset = queryset.select_related('category', 'location', 'author')
+    queryset = queryset.select_related('author').with_cached_lookups()
     queryset = queryset.annotate(comment_count=Count('comments'))
     queryset = queryset.order_by('-pub_date')
 
@@ -0,0 +1,151 @@
+"""Обработчики сигналов моделей приложения blog."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from . import autocomplete, deletion, feeds, lookups, visibility
+from .caching import bump_version
+from .models import Category, Comment, Location, Post
+from .search import get_backend
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, **kwargs):
+    """Обновляет поисковый индекс после сохранения объекта."""
+    transaction.on_commit(lambda: get_backend().index(instance))
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Удаляет объект из поискового индекса."""
+    pk = instance.pk
+    transaction.on_commit(lambda: get_backend().remove(sender, pk))
+
+
+@receiver(post_save, sender=Post)
+def update_post_autocomplete(sender, instance, **kwargs):
+    """Обновляет заголовок поста в индексе автодополнения."""
+    if instance.is_published:
+        extra = {
+            'pub_date': instance.pub_date,
+            'category_id': instance.category_id,
+        }
+        transaction.on_commit(lambda: autocomplete.update_index(
+            autocomplete.POST, instance.pk, instance.title, **extra
+        ))
+    else:
+        remove_post_autocomplete(sender, instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_autocomplete(sender, instance, **kwargs):
+    """Удаляет пост из индекса автодополнения."""
+    if deletion.is_job_running():
+        return
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: autocomplete.update_index(autocomplete.POST, pk)
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_category_autocomplete(sender, instance, **kwargs):
+    """Обновляет категорию в индексе автодополнения."""
+    if instance.is_published:
+        transaction.on_commit(lambda: autocomplete.update_index(
+            autocomplete.CATEGORY, instance.pk, instance.title,
+            slug=instance.slug
+        ))
+    else:
+        remove_category_autocomplete(sender, instance)
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_autocomplete(sender, instance, **kwargs):
+    """Удаляет категорию из индекса автодополнения."""
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: autocomplete.update_index(autocomplete.CATEGORY, pk)
+    )
+
+
+@receiver(post_save, sender=User)
+def update_user_autocomplete(sender, instance, update_fields=None,
+                             **kwargs):
+    """Обновляет имя пользователя в индексе автодополнения."""
+    if update_fields and not {'username', 'is_active'} & set(update_fields):
+        return
+    if instance.is_active:
+        transaction.on_commit(lambda: autocomplete.update_index(
+            autocomplete.USER, instance.pk, instance.username
+        ))
+    else:
+        remove_user_autocomplete(sender, instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_user_autocomplete(sender, instance, **kwargs):
+    """Удаляет пользователя из индекса автодополнения."""
+    if deletion.is_job_running():
+        return
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: autocomplete.update_index(autocomplete.USER, pk)
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=User)
+def invalidate_feeds(sender, **kwargs):
+    """Сбрасывает закэшированные ленты RSS/Atom."""
+    if deletion.is_job_running():
+        return
+    transaction.on_commit(lambda: bump_version(feeds.NAMESPACE))
+
+
+@receiver(post_save, sender=User)
+def invalidate_feeds_on_username_change(sender, update_fields=None,
+                                        **kwargs):
+    """Сбрасывает ленты, если могло измениться имя пользователя."""
+    if not update_fields or 'username' in update_fields:
+        invalidate_feeds(sender)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_lookups(sender, **kwargs):
+    """Сбрасывает справочники категорий и местоположений в памяти."""
+    # Версия меняется сразу, чтобы запись была видна внутри транзакции,
+    # и ещё раз после фиксации: процесс мог перечитать справочники
+    # до того, как изменения стали видны другим соединениям.
+    bump_version(lookups.NAMESPACE)
+    transaction.on_commit(lambda: bump_version(lookups.NAMESPACE))
+
+
+@receiver(pre_save, sender=Post)
+def set_post_visibility(sender, instance, **kwargs):
+    """Вычисляет флаг видимости сохраняемого поста."""
+    instance.is_visible = visibility.is_post_visible(instance)
+
+
+@receiver(post_save, sender=Category)
+def sync_category_visibility(sender, instance, **kwargs):
+    """Переносит публикацию категории на флаг видимости её постов."""
+    visibility.sync_category_posts([instance.pk], instance.is_published)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_deleted_category_posts(sender, instance, **kwargs):
+    """Скрывает посты удаляемой категории."""
+    visibility.hide_category_posts([instance.pk])
@@ -0,0 +1,153 @@
+"""Потоковая генерация карты сайта.
+
+Строки читаются из базы через iterator(), а XML отдаётся по частям,
+поэтому расход памяти не зависит от числа публикаций. Каждый раздел
+делится на файлы не больше чем по SITEMAP_LIMIT адресов, как требует
+протокол sitemaps.org: файл охватывает диапазон первичных ключей и
+читается по индексу.
+"""
+from xml.sax.saxutils import escape
+
+from django.db.models import F, Max, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import iri_to_uri
+
+from .constants import SITEMAP_ITERATOR_CHUNK_SIZE, SITEMAP_LIMIT
+from .models import Category, Post
+from .services import filter_visible_posts
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Значение-заглушка для получения шаблона адреса одним вызовом reverse()
+URL_PLACEHOLDER = 987654321
+
+
+def get_url_template(view_name):
+    """Шаблон адреса с одним параметром для подстановки через format()."""
+    return reverse(view_name, args=(URL_PLACEHOLDER,)).replace(
+        str(URL_PLACEHOLDER), '{}'
+    )
+
+
+def get_posts():
+    """Опубликованные посты."""
+    return filter_visible_posts(Post.objects.all())
+
+
+def get_posts_rows(posts):
+    """Адреса постов: (id, дата публикации)."""
+    return posts.order_by('pk').values_list('pk', 'pub_date')
+
+
+def get_categories():
+    """Опубликованные категории."""
+    return Category.objects.filter(is_published=True)
+
+
+def get_categories_rows(categories):
+    """Адреса категорий: (slug, дата последней публикации)."""
+    return categories.annotate(
+        lastmod=Max('posts__pub_date', filter=Q(
+            posts__is_visible=True,
+            posts__pub_date__lte=timezone.now()
+        ))
+    ).order_by('pk').values_list('slug', 'lastmod')
+
+
+def get_authors_rows(posts):
+    """Адреса авторов постов: (username, дата последней публикации)."""
+    return posts.order_by('author_id').values_list(
+        'author__username'
+    ).annotate(lastmod=Max('pub_date'))
+
+
+# Раздел -> (функция выборки объектов, поле, по диапазонам которого
+# раздел делится на файлы, функция выборки строк, имя маршрута страницы)
+SECTIONS = {
+    'posts': (get_posts, 'pk', get_posts_rows, 'blog:post_detail'),
+    'categories': (get_categories, 'pk', get_categories_rows,
+                   'blog:category_posts'),
+    'authors': (get_posts, 'author_id', get_authors_rows, 'blog:profile'),
+}
+
+
+def get_pages(section):
+    """
+    Номера непустых файлов раздела.
+
+    Файл с номером N содержит объекты, у которых значение поля
+    диапазона лежит в ((N - 1) * SITEMAP_LIMIT, N * SITEMAP_LIMIT], так
+    что в нём не больше SITEMAP_LIMIT адресов, а выбирается он по
+    индексу, без OFFSET.
+    """
+    get_objects, range_field, _, _ = SECTIONS[section]
+    return list(get_objects().annotate(
+        sitemap_page=(F(range_field) - 1) / SITEMAP_LIMIT + 1
+    ).order_by('sitemap_page').values_list(
+        'sitemap_page', flat=True
+    ).distinct())
+
+
+def iter_urls(section, page=None):
+    """
+    Перебирает адреса раздела.
+
+    Args:
+        section: Имя раздела из SECTIONS
+        page: Номер файла раздела, начиная с 1; None — весь раздел
+
+    Yields:
+        tuple: Путь страницы и дата её последнего изменения
+    """
+    get_objects, range_field, get_rows, view_name = SECTIONS[section]
+    url_template = get_url_template(view_name)
+    objects = get_objects()
+    if page is not None:
+        objects = objects.filter(**{
+            f'{range_field}__gt': (page - 1) * SITEMAP_LIMIT,
+            f'{range_field}__lte': page * SITEMAP_LIMIT,
+        })
+    rows = get_rows(objects)
+    for key, lastmod in rows.iterator(chunk_size=SITEMAP_ITERATOR_CHUNK_SIZE):
+        yield iri_to_uri(url_template.format(key)), lastmod
+
+
+def format_lastmod(lastmod):
+    """Дата в формате W3C Datetime."""
+    return lastmod.isoformat(timespec='seconds')
+
+
+def render_urlset(base_url, urls):
+    """Построчно отдаёт XML файла с адресами страниц."""
+    yield XML_HEADER
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for path, lastmod in urls:
+        yield f'<url><loc>{escape(base_url + path)}</loc>'
+        if lastmod:
+            yield f'<lastmod>{format_lastmod(lastmod)}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def render_index(sitemaps):
+    """
+    XML индекса карты сайта.
+
+    Args:
+        sitemaps: Пары (абсолютный адрес файла, дата изменения или None)
+    """
+    parts = [XML_HEADER, f'<sitemapindex xmlns="{XMLNS}">\n']
+    for location, lastmod in sitemaps:
+        parts.append(f'<sitemap><loc>{escape(location)}</loc>')
+        if lastmod:
+            parts.append(f'<lastmod>{format_lastmod(lastmod)}</lastmod>')
+        parts.append('</sitemap>\n')
+    parts.append('</sitemapindex>\n')
+    return ''.join(parts)
+
+
+def get_file_name(section, page):
+    """Имя файла раздела карты сайта."""
+    return f'sitemap-{section}-{page}.xml'
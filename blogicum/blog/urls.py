@@ -2,7 +2,7 @@
 
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
@@ -30,4 +30,22 @@ urlpatterns = [
     path('profile/edit/', views.ProfileEditView.as_view(),
          name='edit_profile'),
     path('profile/<str:username>/', views.profile_view, name='profile'),
+    # Ленты RSS/Atom
+    path('feed/', feeds.PostsFeed().as_view(), name='feed'),
+    path('feed/atom/', feeds.PostsAtomFeed().as_view(), name='feed_atom'),
+    path('category/<slug:category_slug>/feed/',
+         feeds.CategoryPostsFeed().as_view(), name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         feeds.CategoryPostsAtomFeed().as_view(),
+         name='category_feed_atom'),
+    path('profile/<str:username>/feed/',
+         feeds.AuthorPostsFeed().as_view(), name='profile_feed'),
+    path('profile/<str:username>/feed/atom/',
+         feeds.AuthorPostsAtomFeed().as_view(), name='profile_feed_atom'),
+    # Карта сайта
+    path('sitemap.xml', views.sitemap_index, name='sitemap'),
+    path('sitemap-<slug:section>-<int:page>.xml',
+         views.sitemap_section, name='sitemap_section'),
+    # Автодополнение
+    path('autocomplete/', views.autocomplete_view, name='autocomplete'),
 ]
@@ -1,17 +1,23 @@
 """Представления для приложения blog."""
+from http import HTTPStatus
+from itertools import chain
 
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import Http404
+from django.http import (Http404, HttpResponse, HttpResponseRedirect,
+                         JsonResponse, StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.views.generic import CreateView, DeleteView, UpdateView
 
-from .constants import POSTS_PER_PAGE
+from . import autocomplete, deletion, sitemaps, write_queue
+from .constants import (AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_QUERY_LENGTH,
+                        POSTS_PER_PAGE, WRITE_QUEUE_TIMEOUT)
 from .forms import CommentForm, PostForm, RegistrationForm, UserEditForm
 from .mixins import CommentDeleteMixin, CommentUpdateMixin
-from .models import Category, Comment, Post
+from .lookups import get_published_category
+from .models import Comment, Post
 from .services import filter_and_annotate_posts, get_paginated_page
 
 User = get_user_model()
@@ -28,14 +34,12 @@ def index(request):
 
 def category_posts(request, category_slug):
     """Посты категории."""
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
-    )
+    category = get_published_category(category_slug)
+    if category is None:
+        raise Http404('Категория не найдена')
 
     post_list = filter_and_annotate_posts(
-        category.posts.all()
+        Post.objects.filter(category_id=category.id)
     )
 
     page_obj = get_paginated_page(request, post_list, POSTS_PER_PAGE)
@@ -48,18 +52,16 @@ def category_posts(request, category_slug):
 def post_detail(request, post_id):
     """Детали поста."""
     post = get_object_or_404(
-        Post.objects.select_related('category', 'location', 'author'),
+        Post.objects.select_related('author').with_cached_lookups(),
         id=post_id
     )
 
     if request.user != post.author and (
-        not post.is_published
-        or not post.category.is_published
-        or post.pub_date > timezone.now()
+        not post.is_visible or post.pub_date > timezone.now()
     ):
         raise Http404("Пост не найден")
 
-    comments = post.comments.select_related('author').all()
+    comments = list(post.comments.select_related('author'))
     form = CommentForm() if request.user.is_authenticated else None
 
     return render(request, 'blog/detail.html', {
@@ -85,6 +87,48 @@ def profile_view(request, username):
     })
 
 
+def autocomplete_view(request):
+    """Подсказки по заголовкам постов, категорий и именам пользователей."""
+    query = request.GET.get('q', '')[:AUTOCOMPLETE_MAX_QUERY_LENGTH].strip()
+    results = (
+        autocomplete.suggest(query, AUTOCOMPLETE_LIMIT) if query else []
+    )
+    return JsonResponse({'results': results})
+
+
+def sitemap_index(request):
+    """Индекс карты сайта со ссылками на файлы разделов."""
+    locations = [
+        (
+            request.build_absolute_uri(reverse(
+                'blog:sitemap_section',
+                kwargs={'section': section, 'page': page}
+            )),
+            None
+        )
+        for section in sitemaps.SECTIONS
+        for page in sitemaps.get_pages(section)
+    ]
+    return HttpResponse(
+        sitemaps.render_index(locations), content_type='application/xml'
+    )
+
+
+def sitemap_section(request, section, page):
+    """Файл раздела карты сайта, отдаваемый потоком."""
+    if section not in sitemaps.SECTIONS or page < 1:
+        raise Http404('Раздел карты сайта не найден')
+    urls = sitemaps.iter_urls(section, page)
+    first = next(urls, None)
+    if first is None:
+        raise Http404('Файл карты сайта пуст')
+    base_url = request.build_absolute_uri('/').rstrip('/')
+    return StreamingHttpResponse(
+        sitemaps.render_urlset(base_url, chain((first,), urls)),
+        content_type='application/xml'
+    )
+
+
 class RegistrationView(CreateView):
     """Регистрация."""
 
@@ -110,7 +154,22 @@ class ProfileEditView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class QueuedCreateMixin:
+    """Сохраняет новый объект через очередь записи."""
+
+    def form_valid(self, form):
+        try:
+            self.object = write_queue.save(form.instance)
+        except write_queue.WriteQueueTimeout:
+            return HttpResponse(
+                'Сервер перегружен, отправьте форму ещё раз.',
+                status=HTTPStatus.SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(WRITE_QUEUE_TIMEOUT)},
+            )
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class PostCreateView(LoginRequiredMixin, QueuedCreateMixin, CreateView):
     """Создание поста."""
 
     model = Post
@@ -155,6 +214,7 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     """Удаление поста."""
 
     model = Post
+    queryset = Post.objects.with_cached_lookups()
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
     success_url = reverse_lazy('blog:index')
@@ -163,13 +223,12 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         post = self.get_object()
         return self.request.user == post.author
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.object)
-        return context
+    def form_valid(self, form):
+        deletion.delete_post(self.object)
+        return HttpResponseRedirect(self.get_success_url())
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, QueuedCreateMixin, CreateView):
     """Добавление комментария."""
 
     model = Comment
@@ -0,0 +1,61 @@
+"""Поддержка материализованного флага видимости постов.
+
+Флаг Post.is_visible равен «пост опубликован и его категория
+опубликована». Дата публикации в флаг не входит: условие
+pub_date <= now проверяется по тому же индексу (is_visible, pub_date),
+поэтому отложенные посты появляются в ленте ровно в срок.
+"""
+from django.db.models import Q
+
+from .models import Category, Post
+
+
+def is_post_visible(post):
+    """Вычисляет флаг видимости для сохраняемого поста."""
+    return post.is_published and Category.objects.filter(
+        pk=post.category_id, is_published=True
+    ).exists()
+
+
+def sync_category_posts(category_ids, is_published):
+    """
+    Переносит видимость категорий на их посты одним UPDATE.
+
+    Returns:
+        int: Число изменённых постов
+    """
+    return Post.objects.filter(
+        category_id__in=category_ids, is_published=True
+    ).exclude(is_visible=is_published).update(is_visible=is_published)
+
+
+def hide_category_posts(category_ids):
+    """Скрывает посты категорий перед их удалением."""
+    return Post.objects.filter(
+        category_id__in=category_ids, is_visible=True
+    ).update(is_visible=False)
+
+
+def refresh_visibility():
+    """
+    Пересчитывает флаг для всех постов, где он расходится с данными.
+
+    Нужен после массовых изменений в обход сигналов, например
+    QuerySet.update() или загрузки фикстур.
+
+    Returns:
+        int: Число исправленных постов
+    """
+    published_categories = Category.objects.filter(
+        is_published=True
+    ).values('pk')
+    should_be_visible = Q(
+        is_published=True, category__in=published_categories
+    )
+    shown = Post.objects.filter(should_be_visible).filter(
+        is_visible=False
+    ).update(is_visible=True)
+    hidden = Post.objects.exclude(should_be_visible).filter(
+        is_visible=True
+    ).update(is_visible=False)
+    return shown + hidden
@@ -0,0 +1,178 @@
+"""Очередь записи новых объектов.
+
+При всплеске комментариев к одному посту каждый запрос по отдельности
+ждёт единственную блокировку записи SQLite. Если очередь включена
+(BLOG_WRITE_QUEUE), запрос передаёт объект выделенному потоку и ждёт
+его сохранения. Поток забирает всё, что накопилось в очереди, и
+вставляет пачку одним bulk_create в одной транзакции, поэтому чем
+больше всплеск, тем больше объектов приходится на одну блокировку.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections, router, transaction
+from django.db.models.signals import post_save, pre_save
+
+from .constants import WRITE_QUEUE_BATCH_SIZE, WRITE_QUEUE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueueTimeout(Exception):
+    """Объект не дождался записи и снят с очереди; его можно прислать снова."""
+
+
+class WriteQueue:
+    """Очередь объектов на вставку с потоком-писателем."""
+
+    def __init__(self, batch_size=WRITE_QUEUE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def put(self, instance, using):
+        """
+        Ставит объект в очередь.
+
+        Returns:
+            Future: Завершается сохранённым объектом или исключением
+        """
+        future = Future()
+        self.queue.put((instance, using, future))
+        self.start()
+        return future
+
+    def start(self):
+        """Запускает поток-писатель, если он ещё не запущен."""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='blog-write-queue', daemon=True
+                )
+                self.thread.start()
+
+    def take_batch(self):
+        """
+        Ждёт первый объект и забирает накопившиеся за ним.
+
+        Объекты, чьё ожидание истекло, отменены и пропускаются; взятые
+        объекты отменить уже нельзя.
+        """
+        batch = []
+        while not batch:
+            items = [self.queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [
+                item for item in items
+                if item[2].set_running_or_notify_cancel()
+            ]
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.take_batch()
+            close_old_connections()
+            try:
+                self.flush(batch)
+            except Exception as error:
+                logger.exception('Ошибка записи пачки из очереди')
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    def flush(self, batch):
+        """Сохраняет пачку; при ошибке сохраняет объекты по одному."""
+        by_database = {}
+        for item in batch:
+            by_database.setdefault(item[1], []).append(item)
+        for using, items in by_database.items():
+            try:
+                insert_batch([instance for instance, _, _ in items], using)
+            except Exception:
+                save_one_by_one(items)
+            else:
+                for instance, _, future in items:
+                    future.set_result(instance)
+
+
+def insert_batch(instances, using):
+    """Вставляет объекты в одной транзакции, отправляя сигналы сохранения."""
+    by_model = {}
+    for instance in instances:
+        by_model.setdefault(type(instance), []).append(instance)
+    with transaction.atomic(using=using):
+        for model, group in by_model.items():
+            for instance in group:
+                pre_save.send(
+                    sender=model, instance=instance, raw=False,
+                    using=using, update_fields=None
+                )
+            model.objects.using(using).bulk_create(group)
+            for instance in group:
+                post_save.send(
+                    sender=model, instance=instance, created=True,
+                    update_fields=None, raw=False, using=using
+                )
+
+
+def save_one_by_one(items):
+    """Сохраняет объекты по отдельности: ошибка одного не отменяет других."""
+    for instance, using, future in items:
+        instance.pk = None
+        instance._state.adding = True
+        try:
+            instance.save(using=using)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(instance)
+
+
+_write_queue = WriteQueue()
+
+
+def get_queue_depth():
+    """Число объектов, ожидающих записи."""
+    return _write_queue.queue.qsize()
+
+
+def save(instance):
+    """
+    Сохраняет новый объект через очередь записи.
+
+    Без очереди, а также внутри транзакции (её блокировку поток-писатель
+    ждал бы до таймаута) объект сохраняется сразу.
+
+    Если объект не дождался записи за WRITE_QUEUE_TIMEOUT секунд, он
+    снимается с очереди, так что повторная отправка не создаст дубликат.
+    Если поток-писатель уже взял объект, запись дожидается до конца: её
+    время ограничено таймаутом блокировки базы.
+
+    Returns:
+        Model: Сохранённый объект с заполненным pk
+
+    Raises:
+        WriteQueueTimeout: Объект не записан и снят с очереди
+    """
+    using = router.db_for_write(type(instance), instance=instance)
+    if not settings.BLOG_WRITE_QUEUE or (
+        transaction.get_connection(using).in_atomic_block
+    ):
+        instance.save(using=using)
+        return instance
+    future = _write_queue.put(instance, using)
+    try:
+        return future.result(timeout=WRITE_QUEUE_TIMEOUT)
+    except FutureTimeoutError:
+        if future.cancel():
+            raise WriteQueueTimeout from None
+        return future.result()
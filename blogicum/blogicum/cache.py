@@ -0,0 +1,170 @@
+"""Кэш в файле SQLite, общий для всех процессов на сервере.
+
+В отличие от LocMemCache, его видят все рабочие процессы, поэтому в нём
+можно хранить версии данных и журнал изменений, а incr() и add()
+атомарны между процессами. Файл работает в режиме WAL: чтения не
+ждут записей. Каждый поток и процесс открывает своё соединение.
+"""
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Сколько ждать блокировки файла, секунд
+LOCK_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+)
+"""
+
+SET_SQL = """
+INSERT INTO cache (key, value, expires) VALUES (?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value, expires = excluded.expires
+"""
+
+# Перезаписывает только истёкшее значение
+ADD_SQL = SET_SQL + """
+WHERE cache.expires IS NOT NULL AND cache.expires <= ?
+"""
+
+# Не истёкшие значения
+ALIVE = '(expires IS NULL OR expires > ?)'
+
+
+class SQLiteCache(BaseCache):
+    """Бэкенд кэша; LOCATION — путь к файлу базы."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # Django создаёт бэкенд для каждого потока; после fork соединение
+        # родителя использовать нельзя
+        if self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self._path, timeout=LOCK_TIMEOUT, isolation_level=None,
+                check_same_thread=False
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @contextmanager
+    def _write(self):
+        """Транзакция, сразу захватывающая блокировку записи."""
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connect().execute(
+            f'SELECT value FROM cache WHERE key = ? AND {ALIVE}',
+            (key, time.time())
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = self.get_backend_timeout(timeout)
+        with self._write() as connection:
+            self._cull(connection)
+            connection.execute(SET_SQL, (key, value, expires))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = self.get_backend_timeout(timeout)
+        with self._write() as connection:
+            self._cull(connection)
+            return connection.execute(
+                ADD_SQL, (key, value, expires, time.time())
+            ).rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            return connection.execute(
+                f'UPDATE cache SET expires = ? WHERE key = ? AND {ALIVE}',
+                (self.get_backend_timeout(timeout), key, time.time())
+            ).rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            row = connection.execute(
+                f'SELECT value FROM cache WHERE key = ? AND {ALIVE}',
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            connection.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), key)
+            )
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            return connection.execute(
+                'DELETE FROM cache WHERE key = ?', (key,)
+            ).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connect().execute(
+            f'SELECT 1 FROM cache WHERE key = ? AND {ALIVE}',
+            (key, time.time())
+        ).fetchone() is not None
+
+    def clear(self):
+        with self._write() as connection:
+            connection.execute('DELETE FROM cache')
+
+    def _cull(self, connection):
+        """
+        Освобождает место, если записей не меньше MAX_ENTRIES.
+
+        Сначала удаляются истёкшие записи, затем часть тех, что истекают
+        раньше остальных; бессрочные (версии, снимки) удаляются последними.
+        """
+        count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count < self._max_entries:
+            return
+        connection.execute(
+            'DELETE FROM cache WHERE expires <= ?', (time.time(),)
+        )
+        count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            connection.execute('DELETE FROM cache')
+            return
+        connection.execute(
+            'DELETE FROM cache WHERE key IN ('
+            'SELECT key FROM cache ORDER BY expires IS NULL, expires '
+            'LIMIT ?)',
+            (count // self._cull_frequency,)
+        )
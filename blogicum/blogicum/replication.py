@@ -0,0 +1,38 @@
+"""Локальные реплики SQLite.
+
+Реплика — снимок основной базы, снятый через backup API SQLite. Копия
+согласована и не останавливает запись в основную базу, а читатели
+реплики видят либо старый, либо новый снимок целиком.
+"""
+import sqlite3
+
+from django.conf import settings
+
+from .routing import PRIMARY
+
+# Сколько ждать блокировки реплики, пока её читают, секунд
+BACKUP_TIMEOUT = 30
+
+
+def copy_database(source, target):
+    """Копирует базу source в файл target."""
+    source_connection = sqlite3.connect(source, timeout=BACKUP_TIMEOUT)
+    target_connection = sqlite3.connect(target, timeout=BACKUP_TIMEOUT)
+    try:
+        source_connection.backup(target_connection)
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def sync_replicas():
+    """
+    Обновляет все реплики из основной базы.
+
+    Returns:
+        list: Псевдонимы обновлённых реплик
+    """
+    source = settings.DATABASES[PRIMARY]['NAME']
+    for alias in settings.DATABASE_REPLICAS:
+        copy_database(source, settings.DATABASES[alias]['NAME'])
+    return list(settings.DATABASE_REPLICAS)
@@ -0,0 +1,104 @@
+"""Разделение чтения и записи между основной базой и репликами.
+
+На реплики уходят только чтения из безопасных запросов (GET, HEAD),
+у клиента которых нет недавних записей. Все записи, небезопасные
+запросы, команды и фоновые потоки работают с основной базой. После
+записи клиент получает cookie, и до отставания реплик его чтения тоже
+идут в основную базу, чтобы он сразу видел свои изменения.
+"""
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+
+PRIMARY = 'default'
+
+PIN_COOKIE = 'db_primary'
+
+_state = Local()
+
+
+def use_replicas(enabled):
+    """Разрешает или запрещает чтение с реплик в текущем запросе."""
+    _state.use_replicas = enabled
+    _state.wrote = False
+
+
+def has_written():
+    """Была ли запись в основную базу в текущем запросе."""
+    return getattr(_state, 'wrote', False)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Читает из основной базы внутри блока.
+
+    Нужен загрузчикам данных, которые кэшируются под текущей версией:
+    отставшая реплика отдала бы старые данные, и они прожили бы в кэше
+    до следующей смены версии.
+    """
+    enabled = getattr(_state, 'use_replicas', False)
+    _state.use_replicas = False
+    try:
+        yield
+    finally:
+        # Если в блоке была запись, запрос и дальше читает из основной
+        _state.use_replicas = enabled and not has_written()
+
+
+class ReadReplicaRouter:
+    """Направляет чтения на случайную реплику, а записи — в основную базу."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not getattr(_state, 'use_replicas', False):
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Остаток запроса читает из основной базы, чтобы видеть запись
+        _state.use_replicas = False
+        _state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема попадает на реплики вместе с копией основной базы
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaPinMiddleware:
+    """
+    Включает чтение с реплик для запроса и закрепляет писавших клиентов.
+
+    Должен стоять первым, чтобы сессия и пользователь читались уже с
+    выбранной базы.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replicas(
+            request.method in self.safe_methods
+            and PIN_COOKIE not in request.COOKIES
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = has_written()
+            use_replicas(False)
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+        return response
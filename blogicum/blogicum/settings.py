@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from .sqlite import get_options
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -21,9 +23,17 @@ INSTALLED_APPS = [
     'django_bootstrap5',
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
+    'monitoring.apps.MonitoringConfig',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.ServerTimingMiddleware',
+    'monitoring.slowlog.SlowRequestLogMiddleware',
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.memory.MemoryProfileMiddleware',
+    'blogicum.routing.ReplicaPinMiddleware',
+    'monitoring.middleware.QueryBudgetMiddleware',
+    'monitoring.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -37,7 +47,8 @@ ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'monitoring.templates.StrictQueriesDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -57,10 +68,37 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': get_options(os.getenv('SQLITE_PROFILE', 'production')),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Реплики для чтения: снимки основной базы (команда sync_replicas)
+DATABASE_REPLICAS = [
+    f'replica_{number}'
+    for number in range(1, int(os.getenv('SQLITE_REPLICAS', 0)) + 1)
+]
+
+for alias in DATABASE_REPLICAS:
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db_{alias}.sqlite3',
+        'OPTIONS': {
+            'init_command': ';'.join(filter(None, (
+                DATABASES['default']['OPTIONS'].get('init_command'),
+                'PRAGMA query_only=ON',
+            ))),
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blogicum.routing.ReadReplicaRouter']
+
+# Сколько секунд после записи читать из основной базы
+DATABASE_REPLICA_PIN_SECONDS = 30
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,6 +139,16 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Общий для всех рабочих процессов: в нём версии данных, которые
+# процессы держат в памяти, и журнал изменений автодополнения
+CACHES = {
+    'default': {
+        'BACKEND': 'monitoring.cache.InstrumentedSQLiteCache',
+        'LOCATION': os.getenv('CACHE_PATH', BASE_DIR / 'cache.sqlite3'),
+        'OPTIONS': {'MAX_ENTRIES': 10_000},
+    },
+}
+
 
 LOGIN_URL = 'login'
 
@@ -119,6 +167,99 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+BLOG_SEARCH_BACKEND = os.getenv(
+    'BLOG_SEARCH_BACKEND', 'blog.search.database.DatabaseSearchBackend'
+)
+
+BLOG_SEARCH_INDEX_PATH = BASE_DIR / 'search_index.sqlite3'
+
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+BLOG_DELETION_IN_THREAD = True
+
+BLOG_AUTOCOMPLETE_BUILD_IN_THREAD = True
+
+BLOG_WRITE_QUEUE = os.getenv('BLOG_WRITE_QUEUE', '') == '1'
+
+# Проверка бюджетов SQL-запросов: 'raise', 'log' или пустая строка
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', '')
+
+# Поиск N+1 запросов: 'warn', 'raise' или пустая строка
+N_PLUS_ONE_DETECTION = os.getenv(
+    'N_PLUS_ONE_DETECTION', 'warn' if DEBUG else ''
+)
+N_PLUS_ONE_THRESHOLD = 5
+
+# Запрет SQL-запросов во время рендеринга шаблонов
+STRICT_TEMPLATE_QUERIES = os.getenv('STRICT_TEMPLATE_QUERIES', '') == '1'
+
+# Заголовок Server-Timing с разбивкой времени запроса
+SERVER_TIMING = os.getenv('SERVER_TIMING', '1' if DEBUG else '') == '1'
+
+# Профилирование: по заголовку X-Profile с этим токеном и/или доля запросов
+PROFILE_TRIGGER_TOKEN = os.getenv('PROFILE_TRIGGER_TOKEN', '')
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = BASE_DIR / 'profiles'
+
+# Журнал запросов дольше порога, мс; None отключает журнал
+SLOW_REQUEST_MS = (
+    float(os.getenv('SLOW_REQUEST_MS')) if os.getenv('SLOW_REQUEST_MS')
+    else None
+)
+SLOW_LOG_EXPLAIN_COUNT = 3
+# Писать в журнал значения параметров SQL (могут содержать личные данные)
+SLOW_LOG_RAW_PARAMS = os.getenv('SLOW_LOG_RAW_PARAMS', '') == '1'
+
+# Метрики, общие для всех рабочих процессов (страница /metrics/)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '') == '1'
+METRICS_DB_PATH = os.getenv('METRICS_DB_PATH', BASE_DIR / 'metrics.sqlite3')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_GAUGE_TTL = 60
+# Доступ к /metrics/: сотрудникам, по заголовку Authorization: Bearer
+# с этим токеном или с перечисленных адресов. За обратным прокси все
+# запросы приходят с 127.0.0.1, поэтому по умолчанию адресов нет.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [
+    address for address in os.getenv('METRICS_ALLOWED_IPS', '').split(',')
+    if address
+]
+
+LOGS_DIR = BASE_DIR / 'logs'
+
+# Профилирование памяти: доля запросов и файл с профилями
+MEMORY_PROFILE_SAMPLE_RATE = float(os.getenv('MEMORY_PROFILE_SAMPLE_RATE', 0))
+MEMORY_PROFILE_PATH = LOGS_DIR / 'memory_profile.jsonl'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_requests': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': LOGS_DIR / 'slow_requests.jsonl',
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'monitoring.slow_requests': {
+            'handlers': ['slow_requests'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
 os.makedirs(EMAIL_FILE_PATH, exist_ok=True)
 os.makedirs(STATIC_ROOT, exist_ok=True)
 os.makedirs(MEDIA_ROOT, exist_ok=True)
+os.makedirs(LOGS_DIR, exist_ok=True)
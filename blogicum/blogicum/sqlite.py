@@ -0,0 +1,64 @@
+"""Профили настроек SQLite.
+
+PRAGMA применяются к каждому новому соединению через OPTIONS
+init_command. Профиль production включает журнал WAL, при котором
+читатели не блокируют писателя, и ожидание блокировки вместо
+немедленной ошибки «database is locked».
+"""
+
+PRAGMA_PROFILES = {
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        # Отрицательное значение задаёт размер кэша в КиБ: 64 МиБ
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+    # Настройки SQLite по умолчанию
+    'default': {},
+}
+
+
+def get_pragmas(profile):
+    """
+    PRAGMA профиля.
+
+    Raises:
+        ValueError: Если профиль неизвестен
+    """
+    try:
+        return PRAGMA_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f'Неизвестный профиль SQLite: {profile}. '
+            f'Доступны: {", ".join(PRAGMA_PROFILES)}'
+        ) from None
+
+
+def get_init_command(profile):
+    """Строка PRAGMA профиля для OPTIONS['init_command']."""
+    return ';'.join(
+        f'PRAGMA {name}={value}'
+        for name, value in get_pragmas(profile).items()
+    )
+
+
+def get_options(profile):
+    """
+    OPTIONS соединения SQLite для профиля.
+
+    Транзакции профиля production начинаются с BEGIN IMMEDIATE: писатель
+    сразу берёт блокировку и ждёт busy_timeout, а не получает ошибку при
+    попытке повысить блокировку чтения посреди транзакции.
+    """
+    pragmas = get_pragmas(profile)
+    if not pragmas:
+        return {}
+    options = {'init_command': get_init_command(profile)}
+    if 'busy_timeout' in pragmas:
+        options['timeout'] = pragmas['busy_timeout'] / 1000
+        options['transaction_mode'] = 'IMMEDIATE'
+    return options
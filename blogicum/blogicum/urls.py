@@ -18,6 +18,8 @@ urlpatterns = [
     path('auth/registration/',
          RegistrationView.as_view(), name='registration'),
     path('pages/', include('pages.urls')),
+    path('api/', include('blog.api.urls')),
+    path('metrics/', include('monitoring.urls')),
     path('', include('blog.urls')),
 ]
 
@@ -0,0 +1,11 @@
+"""Конфигурация приложения monitoring."""
+
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    """Конфигурация приложения monitoring."""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+    verbose_name = 'Мониторинг'
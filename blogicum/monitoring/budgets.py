@@ -0,0 +1,67 @@
+"""Бюджеты SQL-запросов для представлений.
+
+Бюджет — наибольшее число запросов, которое представление может
+выполнить за один запрос клиента. В него входят чтение сессии и
+пользователя и загрузка холодных кэшей процесса (справочники, ленты).
+Число запросов не должно зависеть от числа постов и комментариев на
+странице, поэтому N+1 сразу выводит представление за пределы бюджета.
+Бюджеты проверяются тестами, а при QUERY_BUDGET_MODE — и во время
+работы (см. QueryBudgetMiddleware).
+"""
+from contextlib import ExitStack
+
+from django.db import connections
+
+QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:post_detail': 6,
+    'blog:create_post': 5,
+    'blog:edit_post': 8,
+    'blog:delete_post': 11,
+    'blog:category_posts': 6,
+    'blog:add_comment': 4,
+    'blog:edit_comment': 7,
+    'blog:delete_comment': 7,
+    'blog:edit_profile': 5,
+    'blog:profile': 7,
+    'blog:feed': 4,
+    'blog:feed_atom': 4,
+    'blog:category_feed': 5,
+    'blog:category_feed_atom': 5,
+    'blog:profile_feed': 5,
+    'blog:profile_feed_atom': 5,
+    'blog:sitemap': 3,
+    'blog:sitemap_section': 1,
+    'blog:autocomplete': 3,
+    'pages:about': 2,
+    'pages:rules': 2,
+}
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем позволяет бюджет."""
+
+
+def get_budget(view_name):
+    """Бюджет представления или None, если он не задан."""
+    return QUERY_BUDGETS.get(view_name)
+
+
+class QueryCounter:
+    """Считает запросы ко всем базам, в том числе при DEBUG = False."""
+
+    def __init__(self):
+        self.count = 0
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
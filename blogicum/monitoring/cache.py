@@ -0,0 +1,43 @@
+"""Бэкенды кэша с подсчётом попаданий и промахов."""
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+
+from blogicum.cache import SQLiteCache
+
+from . import timing
+from .metrics import registry
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """
+    Сообщает о попаданиях и промахах в метрики запроса и в реестр.
+
+    get_many() базового класса вызывает get() для каждого ключа, поэтому
+    учитывается и он.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        hit = value is not _MISSING
+        timing.record_cache(int(hit), int(not hit))
+        if settings.METRICS_ENABLED:
+            registry.inc('blogicum_cache_requests_total', {
+                'namespace': get_namespace(key),
+                'result': 'hit' if hit else 'miss',
+            })
+        return value if hit else default
+
+
+def get_namespace(key):
+    """Пространство имён ключа: две первые части, blog:feed:… → blog:feed."""
+    return ':'.join(str(key).split(':', 2)[:2])
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    """LocMemCache с подсчётом попаданий."""
+
+
+class InstrumentedSQLiteCache(InstrumentedCacheMixin, SQLiteCache):
+    """Общий кэш в SQLite с подсчётом попаданий."""
@@ -0,0 +1,52 @@
+"""Команда отчёта о памяти, выделяемой представлениями."""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.memory import build_report
+
+
+def format_size(size):
+    for unit in ('Б', 'КиБ', 'МиБ'):
+        if abs(size) < 1024:
+            return f'{size:.0f} {unit}'
+        size /= 1024
+    return f'{size:.1f} ГиБ'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводка профилей памяти (MEMORY_PROFILE_PATH) по представлениям: '
+        'пик выделенной памяти и места, выделяющие больше всего.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.MEMORY_PROFILE_PATH,
+                            help='Файл с профилями.')
+        parser.add_argument('--limit', type=int, default=10,
+                            help='Сколько представлений показать.')
+        parser.add_argument('--sites', type=int, default=3,
+                            help='Сколько мест выделения показать.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as log:
+                records = [json.loads(line) for line in log if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(
+                f'Нет файла профилей {options["path"]}; включите '
+                f'MEMORY_PROFILE_SAMPLE_RATE.'
+            )
+        report = build_report(records)[:options['limit']]
+        for view in report:
+            self.stdout.write(
+                f'{view["view"]}: запросов {view["requests"]}, '
+                f'пик в среднем {format_size(view["peak_avg"])}, '
+                f'наибольший {format_size(view["peak_max"])}'
+            )
+            for site, size in view['sites'][:options['sites']]:
+                self.stdout.write(f'    {format_size(size):>10}  {site}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Профилей: {len(records)}.'
+        ))
@@ -0,0 +1,70 @@
+"""Команда нагрузочного прогона записанного трафика."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.replay import ReplayError, load_records, replay, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Воспроизводит журнал запросов (JSONL: method, path, user, think, '
+        'data) на blogicum.wsgi.application в этом процессе и печатает '
+        'пропускную способность и перцентили задержки. Чтобы сравнить '
+        'профили настроек, запускайте с разными переменными окружения '
+        'или --settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('log', help='Файл журнала запросов.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Число одновременных исполнителей.')
+        parser.add_argument('--processes', action='store_true',
+                            help='Исполнители — процессы, а не потоки.')
+        parser.add_argument('--think-scale', type=float, default=1.0,
+                            help='Множитель пауз; 0 — без пауз.')
+        parser.add_argument('--repeat', type=int, default=1,
+                            help='Сколько раз воспроизвести журнал.')
+        parser.add_argument('--host', default='localhost',
+                            help='Значение заголовка Host.')
+        parser.add_argument('--output',
+                            help='Сохранить сводку в JSON-файл.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['repeat'] < 1:
+            raise CommandError('--workers и --repeat должны быть больше 0.')
+        try:
+            with open(options['log'], encoding='utf-8') as log:
+                records = load_records(log) * options['repeat']
+            if not records:
+                raise ReplayError('Журнал пуст')
+            results, elapsed = replay(
+                records, workers=options['workers'],
+                processes=options['processes'],
+                think_scale=options['think_scale'], host=options['host'],
+            )
+        except (OSError, ReplayError) as error:
+            raise CommandError(error)
+        summary = summarize(results, elapsed)
+        latency = summary['latency_ms']
+        self.stdout.write(
+            f'Запросов: {summary["requests"]}, ошибок: {summary["errors"]}, '
+            f'за {summary["seconds"]} с, {summary["rps"]} запросов/с'
+        )
+        self.stdout.write(
+            f'Задержка, мс: p50 {latency["p50"]}, p95 {latency["p95"]}, '
+            f'p99 {latency["p99"]}, макс. {latency["max"]}'
+        )
+        self.stdout.write('Коды ответов: ' + ', '.join(
+            f'{status}: {count}'
+            for status, count in summary['statuses'].items()
+        ))
+        for view, stats in summary['views'].items():
+            self.stdout.write(
+                f'    {view:<40} {stats["requests"]:>6}  '
+                f'p50 {stats["p50"]:>8}  p95 {stats["p95"]:>8}'
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(summary, output, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS('Прогон завершён.'))
@@ -0,0 +1,146 @@
+"""Профилирование памяти запросов через tracemalloc.
+
+Доля запросов MEMORY_PROFILE_SAMPLE_RATE выполняется между двумя
+снимками tracemalloc; трассировка включается только на время такого
+запроса. Для каждого такого запроса в MEMORY_PROFILE_PATH
+(JSONL) пишутся пик выделенной памяти и места, выделившие больше всего.
+Отчёт по представлениям строит команда memory_report.
+
+Одновременно профилируется не больше одного запроса. tracemalloc
+учитывает все потоки процесса, поэтому при параллельных запросах в
+профиль попадают и чужие выделения; для точных измерений профилируйте
+однопоточный сервер.
+"""
+import json
+import logging
+import random
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Глубина стека, запоминаемая для каждого выделения
+TRACEMALLOC_FRAMES = 10
+
+TOP_SITES_COUNT = 10
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+_write_lock = threading.Lock()
+_profile_lock = threading.Lock()
+
+
+def take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def get_top_sites(before, after, limit=TOP_SITES_COUNT):
+    """
+    Места, выделившие больше всего памяти между снимками.
+
+    Returns:
+        list: Словари с файлом, строкой, приростом в байтах и числом блоков
+    """
+    sites = []
+    for stat in after.compare_to(before, 'lineno')[:limit]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        sites.append({
+            'file': frame.filename,
+            'line': frame.lineno,
+            'size': stat.size_diff,
+            'count': stat.count_diff,
+        })
+    return sites
+
+
+def write_record(record):
+    with _write_lock, open(
+        settings.MEMORY_PROFILE_PATH, 'a', encoding='utf-8'
+    ) as log:
+        log.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class MemoryProfileMiddleware:
+    """Снимает профиль памяти для выборки запросов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.MEMORY_PROFILE_SAMPLE_RATE
+        if not rate or random.random() >= rate:
+            return self.get_response(request)
+        # Профилируется один запрос за раз: трассировка общая для процесса
+        if not _profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        started_here = not tracemalloc.is_tracing()
+        try:
+            if started_here:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            before = take_snapshot()
+            current_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            response = self.get_response(request)
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = take_snapshot()
+        finally:
+            # Трассировка замедляет каждое выделение памяти, поэтому
+            # остальные запросы выполняются без неё
+            if started_here:
+                tracemalloc.stop()
+            _profile_lock.release()
+        match = request.resolver_match
+        write_record({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'peak': max(0, peak - current_before),
+            'retained': max(0, current_after - current_before),
+            'top': get_top_sites(before, after),
+        })
+        return response
+
+
+def build_report(records):
+    """
+    Сводка по представлениям.
+
+    Returns:
+        list: Для каждого представления число запросов, средний и
+            наибольший пик и суммарный прирост по местам выделения;
+            отсортировано по наибольшему пику
+    """
+    views = {}
+    for record in records:
+        view = views.setdefault(record['view'] or record['path'], {
+            'view': record['view'] or record['path'],
+            'requests': 0,
+            'peak_total': 0,
+            'peak_max': 0,
+            'sites': {},
+        })
+        view['requests'] += 1
+        view['peak_total'] += record['peak']
+        view['peak_max'] = max(view['peak_max'], record['peak'])
+        for site in record['top']:
+            key = f'{site["file"]}:{site["line"]}'
+            view['sites'][key] = view['sites'].get(key, 0) + site['size']
+    for view in views.values():
+        view['peak_avg'] = view.pop('peak_total') // view['requests']
+        view['sites'] = sorted(
+            view['sites'].items(), key=lambda item: item[1], reverse=True
+        )[:TOP_SITES_COUNT]
+    return sorted(views.values(), key=lambda view: view['peak_max'],
+                  reverse=True)
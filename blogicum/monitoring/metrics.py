@@ -0,0 +1,192 @@
+"""Реестр метрик с общим хранилищем для всех процессов.
+
+Каждый процесс копит приращения счётчиков в памяти и раз в
+METRICS_FLUSH_INTERVAL секунд переносит их в общий файл SQLite
+(METRICS_DB_PATH) одним UPSERT. Страница метрик читает этот файл, так
+что в ней сложены данные всех рабочих процессов. Показатели процессов
+(память) хранятся с меткой pid и устаревают через METRICS_GAUGE_TTL.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+# Границы корзин гистограммы длительности запросов, секунды
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    sample TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    family TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (sample, labels)
+) WITHOUT ROWID
+"""
+
+INCREMENT_SQL = """
+INSERT INTO metrics (sample, labels, family, kind, value, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (sample, labels) DO UPDATE SET
+    value = value + excluded.value, updated_at = excluded.updated_at
+"""
+
+SET_SQL = """
+INSERT INTO metrics (sample, labels, family, kind, value, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (sample, labels) DO UPDATE SET
+    value = excluded.value, updated_at = excluded.updated_at
+"""
+
+
+def format_labels(labels):
+    """Метки в формате Prometheus в фиксированном порядке."""
+    return ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n')
+        )
+        for name, value in sorted(labels.items())
+    )
+
+
+def format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class MetricsRegistry:
+    """Приращения метрик процесса, ожидающие записи в общее хранилище."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.increments = {}
+        self.gauges = {}
+        self.flushed_at = time.monotonic()
+
+    def inc(self, family, labels, amount=1, kind=COUNTER, sample=None):
+        """Увеличивает счётчик."""
+        key = (sample or family, format_labels(labels), family, kind)
+        with self.lock:
+            self.increments[key] = self.increments.get(key, 0) + amount
+
+    def set(self, family, labels, value):
+        """Задаёт значение показателя."""
+        key = (family, format_labels(labels), family, GAUGE)
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, family, labels, value, buckets=LATENCY_BUCKETS):
+        """Учитывает наблюдение в гистограмме."""
+        for bound in buckets:
+            if value <= bound:
+                self.inc(family, {**labels, 'le': bound}, kind=HISTOGRAM,
+                         sample=f'{family}_bucket')
+        self.inc(family, {**labels, 'le': '+Inf'}, kind=HISTOGRAM,
+                 sample=f'{family}_bucket')
+        self.inc(family, labels, value, kind=HISTOGRAM,
+                 sample=f'{family}_sum')
+        self.inc(family, labels, kind=HISTOGRAM, sample=f'{family}_count')
+
+    def flush_if_due(self):
+        """Записывает приращения, если с прошлой записи прошло достаточно."""
+        if time.monotonic() - self.flushed_at >= (
+            settings.METRICS_FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def flush(self):
+        """Переносит накопленное в общее хранилище."""
+        self.set('process_resident_memory_bytes', {'pid': os.getpid()},
+                 get_rss())
+        with self.lock:
+            increments, self.increments = self.increments, {}
+            gauges, self.gauges = self.gauges, {}
+            self.flushed_at = time.monotonic()
+        now = time.time()
+        with connect() as connection:
+            connection.executemany(INCREMENT_SQL, (
+                (*key, value, now) for key, value in increments.items()
+            ))
+            connection.executemany(SET_SQL, (
+                (*key, value, now) for key, value in gauges.items()
+            ))
+        connection.close()
+
+
+registry = MetricsRegistry()
+
+
+def connect():
+    """Соединение с общим хранилищем метрик."""
+    connection = sqlite3.connect(settings.METRICS_DB_PATH, timeout=5)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute(SCHEMA)
+    return connection
+
+
+def get_rss():
+    """Резидентная память процесса, байт."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # ru_maxrss — пик, а не текущее значение; лучше, чем ничего
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def collect_queue_depths():
+    """Показатели очередей фоновых задач на момент чтения метрик."""
+    from blog import write_queue
+    from blog.models import DeletionJob
+
+    registry.set('blogicum_queue_depth', {'queue': 'write_queue',
+                                          'pid': os.getpid()},
+                 write_queue.get_queue_depth())
+    for status in (DeletionJob.PENDING, DeletionJob.RUNNING):
+        registry.set(
+            'blogicum_deletion_jobs', {'status': status},
+            DeletionJob.objects.filter(status=status).count()
+        )
+
+
+def render():
+    """Все метрики в текстовом формате Prometheus."""
+    collect_queue_depths()
+    registry.flush()
+    connection = connect()
+    try:
+        connection.execute(
+            'DELETE FROM metrics WHERE kind = ? AND updated_at < ?',
+            (GAUGE, time.time() - settings.METRICS_GAUGE_TTL)
+        )
+        connection.commit()
+        rows = connection.execute(
+            'SELECT family, kind, sample, labels, value FROM metrics '
+            'ORDER BY family, sample, labels'
+        ).fetchall()
+    finally:
+        connection.close()
+    lines = []
+    family_seen = None
+    for family, kind, sample, labels, value in rows:
+        if family != family_seen:
+            lines.append(f'# TYPE {family} {kind}')
+            family_seen = family
+        labels = f'{{{labels}}}' if labels else ''
+        lines.append(f'{sample}{labels} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
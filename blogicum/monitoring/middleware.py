@@ -0,0 +1,157 @@
+"""Промежуточные слои приложения monitoring."""
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+from .budgets import QueryBudgetExceeded, QueryCounter, get_budget
+from .metrics import registry
+from .timing import RequestTimings, get_current
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Проверяет бюджет SQL-запросов представления.
+
+    Режим задаёт QUERY_BUDGET_MODE: 'raise' — превышение бюджета
+    вызывает QueryBudgetExceeded, 'log' — пишется предупреждение, пустое
+    значение отключает проверку. Запросы, выполненные при отдаче
+    потокового ответа, не учитываются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if not mode:
+            return self.get_response(request)
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        match = request.resolver_match
+        budget = get_budget(match.view_name) if match else None
+        if budget is not None and counter.count > budget:
+            message = (
+                f'{request.method} {request.path} ({match.view_name}): '
+                f'{counter.count} SQL-запросов при бюджете {budget}'
+            )
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Заголовок Server-Timing с разбивкой времени запроса и профилирование.
+
+    В заголовке: total — весь запрос, view — представление вместе с
+    рендерингом шаблонов, tpl — рендеринг шаблонов, db — SQL-запросы и
+    их число, cache — попадания и промахи кэша. Заголовок добавляется
+    при SERVER_TIMING.
+
+    Запрос профилируется cProfile, если в заголовке X-Profile передан
+    PROFILE_TRIGGER_TOKEN или он попал в выборку PROFILE_SAMPLE_RATE;
+    статистика сохраняется в PROFILE_DIR в формате pstats.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profiler = cProfile.Profile() if self.should_profile(request) else None
+        if not settings.SERVER_TIMING and profiler is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with RequestTimings() as timings:
+            request._view_started = None
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finished = time.perf_counter()
+        if profiler is not None:
+            self.dump_profile(request, profiler)
+        if settings.SERVER_TIMING:
+            view_time = (
+                finished - request._view_started
+                if request._view_started else 0.0
+            )
+            response['Server-Timing'] = format_server_timing(
+                timings, view_time, finished - started
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+    def should_profile(self, request):
+        token = settings.PROFILE_TRIGGER_TOKEN
+        header = request.headers.get('X-Profile', '')
+        if token and header and constant_time_compare(header, token):
+            return True
+        rate = settings.PROFILE_SAMPLE_RATE
+        return bool(rate) and random.random() < rate
+
+    def dump_profile(self, request, profiler):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r'[^\w-]+', '_', request.path).strip('_') or 'root'
+        path = os.path.join(
+            settings.PROFILE_DIR,
+            f'{time.strftime("%Y%m%d-%H%M%S")}-{time.time_ns() % 10 ** 9}'
+            f'-{request.method}-{slug[:80]}.pstats'
+        )
+        profiler.dump_stats(path)
+        logger.info('Профиль запроса %s сохранён в %s', request.path, path)
+
+
+def format_server_timing(timings, view_time, total_time):
+    """Значение заголовка Server-Timing; время в миллисекундах."""
+    return ', '.join((
+        f'total;dur={total_time * 1000:.1f}',
+        f'view;dur={view_time * 1000:.1f}',
+        f'tpl;dur={timings.template_time * 1000:.1f}',
+        f'db;dur={timings.db_time * 1000:.1f};'
+        f'desc="{timings.db_queries} queries"',
+        f'cache;desc="hits={timings.cache_hits} '
+        f'misses={timings.cache_misses}"',
+    ))
+
+
+class MetricsMiddleware:
+    """Учитывает запрос в реестре метрик (при METRICS_ENABLED)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        current = get_current()
+        started = time.perf_counter()
+        with nullcontext(current) if current else RequestTimings() as timings:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+        match = request.resolver_match
+        view = {'view': match.view_name if match else 'unmatched'}
+        registry.inc('blogicum_requests_total', {
+            **view, 'method': request.method,
+            'status': response.status_code,
+        })
+        registry.observe('blogicum_request_duration_seconds', view, elapsed)
+        registry.inc('blogicum_db_queries_total', view, timings.db_queries)
+        registry.inc('blogicum_db_query_seconds_total', view,
+                     timings.db_time)
+        registry.flush_if_due()
+        return response
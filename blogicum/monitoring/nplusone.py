@@ -0,0 +1,152 @@
+"""Обнаружение N+1 запросов.
+
+NPlusOneDetector группирует SELECT-запросы по нормализованному тексту
+(параметры и списки IN отброшены). Если запрос одного вида выполнился
+N_PLUS_ONE_THRESHOLD раз и больше, это почти всегда ленивое обращение
+к связи в цикле. Для такого запроса запоминается место в коде проекта
+и, если запрос выполнен при рендеринге, шаблон и строка.
+
+NPlusOneMiddleware проверяет каждый запрос к сайту, включая админку:
+в режиме 'warn' (по умолчанию при DEBUG) пишет в журнал и выдаёт
+NPlusOneWarning, в режиме 'raise' (включён в тестах, см. conftest.py)
+выбрасывает NPlusOneError.
+"""
+import logging
+import re
+import sys
+import warnings
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+MONITORING_DIR = str(Path(__file__).resolve().parent)
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class NPlusOneWarning(UserWarning):
+    """Повторяющиеся однотипные SQL-запросы."""
+
+
+class NPlusOneError(Exception):
+    """Повторяющиеся однотипные SQL-запросы в режиме 'raise'."""
+
+
+def normalize(sql):
+    """Вид запроса: текст без списков IN и лишних пробелов."""
+    return IN_LIST_RE.sub('IN (...)', WHITESPACE_RE.sub(' ', sql.strip()))
+
+
+def get_code_location():
+    """Первая строка кода проекта в стеке вызовов, кроме monitoring."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_DIR) and not filename.startswith(
+            MONITORING_DIR
+        ):
+            return (
+                f'{Path(filename).relative_to(PROJECT_DIR)}:'
+                f'{frame.f_lineno} ({frame.f_code.co_name})'
+            )
+        frame = frame.f_back
+    return None
+
+
+def get_template_location():
+    """Шаблон и строка, при рендеринге которых выполняется запрос."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            context = frame.f_locals.get('context')
+            template = getattr(
+                getattr(context, 'render_context', None), 'template', None
+            )
+            token = getattr(node, 'token', None)
+            if template is not None and token is not None:
+                name = template.origin.template_name or template.origin.name
+                return f'{name}, строка {token.lineno}'
+        frame = frame.f_back
+    return None
+
+
+class NPlusOneDetector:
+    """Считает SELECT-запросы по видам на время блока with."""
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.counts = {}
+        self.locations = {}
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() == 'SELECT':
+            shape = normalize(sql)
+            count = self.counts.get(shape, 0) + 1
+            self.counts[shape] = count
+            # Место запоминается при первом повторе: это и есть цикл
+            if count == 2:
+                self.locations[shape] = (
+                    get_code_location(), get_template_location()
+                )
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+    def get_problems(self):
+        """
+        Найденные N+1.
+
+        Returns:
+            list: Строки с описанием вида запроса, числа повторов и места
+        """
+        problems = []
+        for shape, count in self.counts.items():
+            if count < self.threshold:
+                continue
+            code, template = self.locations.get(shape, (None, None))
+            where = ', '.join(filter(None, (
+                code and f'код {code}', template and f'шаблон {template}'
+            )))
+            problems.append(
+                f'{count} запросов вида «{shape}»'
+                + (f'; {where}' if where else '')
+            )
+        return problems
+
+
+class NPlusOneMiddleware:
+    """Ищет N+1 в каждом запросе к сайту (при N_PLUS_ONE_DETECTION)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.N_PLUS_ONE_DETECTION
+        if not mode:
+            return self.get_response(request)
+        with NPlusOneDetector() as detector:
+            response = self.get_response(request)
+        problems = detector.get_problems()
+        if problems:
+            message = f'N+1 в {request.method} {request.path}: ' + '; '.join(
+                problems
+            )
+            if mode == 'raise':
+                raise NPlusOneError(message)
+            logger.warning(message)
+            warnings.warn(message, NPlusOneWarning)
+        return response
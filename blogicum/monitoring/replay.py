@@ -0,0 +1,305 @@
+"""Воспроизведение записанного трафика на WSGI-приложении в процессе.
+
+Журнал — JSONL, по запросу в строке:
+    {"method": "GET", "path": "/posts/1/", "user": "alice", "think": 0.5}
+Обязателен только path. user — имя существующего пользователя, от лица
+которого выполняется запрос; think — пауза в секундах перед запросом;
+data — поля формы для POST.
+
+Запросы делятся между исполнителями (потоками или процессами) так, что
+все запросы одного пользователя попадают к одному исполнителю в порядке
+журнала; анонимные распределяются отдельно, выравнивая нагрузку.
+Каждый исполнитель выполняет свою долю последовательно, выдерживая
+паузы, и вызывает blogicum.wsgi.application напрямую, без сети и
+сервера.
+"""
+import io
+import json
+import math
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import import_module
+from multiprocessing import get_context
+from urllib.parse import unquote, urlencode
+
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY, get_user_model)
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils.crypto import get_random_string
+
+# Значение csrftoken для всех запросов; передаётся и в заголовке
+CSRF_TOKEN = get_random_string(32)
+
+PERCENTILES = (50, 95, 99)
+
+
+class ReplayError(Exception):
+    """Ошибка в журнале запросов."""
+
+
+def load_records(lines):
+    """
+    Разбирает журнал.
+
+    Returns:
+        list: Словари с ключами method, path, user, think и data
+    """
+    records = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            path = record['path']
+        except (ValueError, KeyError, TypeError):
+            raise ReplayError(f'Строка {number}: нужен JSON с полем path')
+        records.append({
+            'method': record.get('method', 'GET').upper(),
+            'path': path,
+            'user': record.get('user') or None,
+            'think': float(record.get('think') or 0),
+            'data': record.get('data') or {},
+        })
+    return records
+
+
+def create_sessions(usernames):
+    """
+    Создаёт сессии, в которых пользователи уже вошли на сайт.
+
+    Сессии действующие, поэтому replay удаляет их по окончании прогона.
+
+    Returns:
+        dict: Ключ сессии по имени пользователя
+    """
+    users = list(get_user_model().objects.filter(username__in=usernames))
+    missing = set(usernames) - {user.username for user in users}
+    if missing:
+        raise ReplayError(
+            f'Нет пользователей: {", ".join(sorted(missing))}'
+        )
+    engine = import_module(settings.SESSION_ENGINE)
+    sessions = {}
+    for user in users:
+        session = engine.SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        sessions[user.username] = session.session_key
+    return sessions
+
+
+def delete_sessions(sessions):
+    """Удаляет сессии, созданные create_sessions."""
+    engine = import_module(settings.SESSION_ENGINE)
+    for session_key in sessions.values():
+        engine.SessionStore(session_key=session_key).delete()
+
+
+def partition(records, workers):
+    """
+    Делит журнал между исполнителями, сохраняя сессии пользователей.
+
+    Пользователи достаются наименее загруженному исполнителю, начиная с
+    самых активных; затем так же по одному раздаются анонимные запросы.
+    Внутри доли сохраняется порядок журнала.
+
+    Returns:
+        list: Доли журнала, по одной на исполнителя
+    """
+    sessions = {}
+    anonymous = []
+    for position, record in enumerate(records):
+        if record['user']:
+            sessions.setdefault(record['user'], []).append(position)
+        else:
+            anonymous.append([position])
+    streams = [[] for _ in range(workers)]
+    for positions in (
+        sorted(sessions.values(), key=len, reverse=True) + anonymous
+    ):
+        min(streams, key=len).extend(positions)
+    return [
+        [records[position] for position in sorted(stream)]
+        for stream in streams
+    ]
+
+
+def build_environ(record, session_key, host):
+    """WSGI-окружение для запроса из журнала."""
+    path, _, query = record['path'].partition('?')
+    body = urlencode(record['data'], doseq=True).encode()
+    cookies = [f'{settings.CSRF_COOKIE_NAME}={CSRF_TOKEN}']
+    if session_key:
+        cookies.append(f'{settings.SESSION_COOKIE_NAME}={session_key}')
+    return {
+        'REQUEST_METHOD': record['method'],
+        'PATH_INFO': unquote(path),
+        'QUERY_STRING': query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': host,
+        'HTTP_COOKIE': '; '.join(cookies),
+        'HTTP_X_CSRFTOKEN': CSRF_TOKEN,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+
+def call_application(application, environ):
+    """
+    Выполняет запрос и читает ответ целиком.
+
+    Returns:
+        tuple: Код ответа (0 при исключении) и размер тела в байтах
+    """
+    status = []
+
+    def start_response(status_line, headers, exc_info=None):
+        status.append(int(status_line.split(' ', 1)[0]))
+
+    try:
+        response = application(environ, start_response)
+        try:
+            size = sum(len(chunk) for chunk in response)
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+    except Exception:
+        return 0, 0
+    return status[0], size
+
+
+def replay_stream(records, sessions, think_scale, host):
+    """
+    Выполняет запросы одного исполнителя по порядку.
+
+    Returns:
+        list: Кортежи (метод, адрес, код ответа, секунды, байты)
+    """
+    from blogicum.wsgi import application
+
+    results = []
+    try:
+        for record in records:
+            if record['think'] and think_scale:
+                time.sleep(record['think'] * think_scale)
+            environ = build_environ(record, sessions.get(record['user']),
+                                    host)
+            started = time.perf_counter()
+            status, size = call_application(application, environ)
+            results.append((record['method'], record['path'], status,
+                            time.perf_counter() - started, size))
+    finally:
+        connections.close_all()
+    return results
+
+
+def replay(records, workers=1, processes=False, think_scale=1.0,
+           host='localhost'):
+    """
+    Воспроизводит журнал на workers потоках или процессах.
+
+    Returns:
+        tuple: Результаты всех запросов и общее время в секундах
+    """
+    sessions = create_sessions(
+        {record['user'] for record in records if record['user']}
+    )
+    try:
+        streams = partition(records, workers)
+        if processes:
+            # Дочерние процессы наследуют настройки Django, но не
+            # соединения
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                workers, mp_context=get_context('fork')
+            )
+        else:
+            executor = ThreadPoolExecutor(workers)
+        started = time.perf_counter()
+        with executor:
+            futures = [
+                executor.submit(replay_stream, stream, sessions,
+                                think_scale, host)
+                for stream in streams if stream
+            ]
+            results = [
+                result for future in futures for result in future.result()
+            ]
+        return results, time.perf_counter() - started
+    finally:
+        delete_sessions(sessions)
+
+
+def percentile(values, percent):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def get_view_name(path):
+    try:
+        return resolve(path.partition('?')[0]).view_name
+    except Resolver404:
+        return '<404>'
+
+
+def describe(latencies):
+    """Задержки в миллисекундах: перцентили, среднее и максимум."""
+    report = {
+        f'p{percent}': round(percentile(latencies, percent) * 1000, 2)
+        for percent in PERCENTILES
+    }
+    report['mean'] = round(statistics.fmean(latencies) * 1000, 2)
+    report['max'] = round(max(latencies) * 1000, 2)
+    return report
+
+
+def summarize(results, elapsed):
+    """
+    Сводка прогона.
+
+    Returns:
+        dict: Число запросов и ошибок, пропускная способность, задержки
+            в целом и по представлениям, коды ответов
+    """
+    statuses = {}
+    views = {}
+    for method, path, status, seconds, size in results:
+        statuses[status] = statuses.get(status, 0) + 1
+        views.setdefault(f'{method} {get_view_name(path)}', []).append(
+            seconds
+        )
+    return {
+        'requests': len(results),
+        'errors': sum(
+            count for status, count in statuses.items()
+            if status == 0 or status >= 500
+        ),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(results) / elapsed, 2) if elapsed else 0,
+        'bytes': sum(result[4] for result in results),
+        'latency_ms': describe([result[3] for result in results]),
+        'statuses': {str(status): count
+                     for status, count in sorted(statuses.items())},
+        'views': {
+            view: {'requests': len(latencies), **describe(latencies)}
+            for view, latencies in sorted(views.items())
+        },
+    }
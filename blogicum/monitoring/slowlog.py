@@ -0,0 +1,137 @@
+"""Журнал медленных запросов.
+
+Если обработка запроса заняла больше SLOW_REQUEST_MS миллисекунд, в
+журнал monitoring.slow_requests (ротируемый JSONL-файл, см. LOGGING)
+пишется строка с адресом, временем и всеми SQL-запросами с их
+длительностью. Для SLOW_LOG_EXPLAIN_COUNT самых долгих SELECT
+добавляется план выполнения EXPLAIN QUERY PLAN. SQL перехватывается
+через execute_wrapper, поэтому в журнал попадают запросы представлений,
+админки и проверки форм.
+
+Значения параметров (хэши паролей, данные сессий, адреса почты) в
+журнал не пишутся, только их число и типы; SLOW_LOG_RAW_PARAMS = True
+включает запись значений для отладки.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('monitoring.slow_requests')
+
+# Сколько запросов хранить для одной записи журнала
+MAX_LOGGED_QUERIES = 200
+
+
+class QueryRecorder:
+    """Запоминает SQL-запросы с их длительностью."""
+
+    def __init__(self):
+        self.queries = []
+        self.count = 0
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.queries) < MAX_LOGGED_QUERIES:
+                self.queries.append({
+                    'db': context['connection'].alias,
+                    'sql': sql,
+                    'params': None if many else params,
+                    'many': many,
+                    'ms': round((time.perf_counter() - started) * 1000, 3),
+                })
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+
+def explain(query):
+    """
+    План выполнения запроса.
+
+    Returns:
+        list | None: Строки плана или None, если план получить нельзя
+    """
+    connection = connections[query['db']]
+    prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {query["sql"]}', query['params'])
+            return [list(row) for row in cursor.fetchall()]
+    except Exception:
+        return None
+
+
+def describe_params(query):
+    """Параметры запроса для журнала: значения или только число и типы."""
+    params = query.pop('params')
+    many = query.pop('many')
+    if settings.SLOW_LOG_RAW_PARAMS:
+        query['params'] = params
+    elif not many and params is not None:
+        values = params.values() if isinstance(params, dict) else params
+        query['param_types'] = [type(value).__name__ for value in values]
+
+
+def build_entry(request, status, elapsed, recorder):
+    """Запись журнала о медленном запросе."""
+    queries = recorder.queries
+    selects = [
+        query for query in queries
+        if query['sql'].lstrip().upper().startswith('SELECT')
+    ]
+    for query in sorted(selects, key=lambda query: query['ms'],
+                        reverse=True)[:settings.SLOW_LOG_EXPLAIN_COUNT]:
+        query['plan'] = explain(query)
+    for query in queries:
+        describe_params(query)
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': (
+            request.resolver_match.view_name
+            if request.resolver_match else None
+        ),
+        'status': status,
+        'ms': round(elapsed * 1000, 3),
+        'query_count': recorder.count,
+        'query_ms': round(sum(query['ms'] for query in queries), 3),
+        'queries': queries,
+    }
+
+
+class SlowRequestLogMiddleware:
+    """Пишет в журнал запросы дольше SLOW_REQUEST_MS миллисекунд."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.SLOW_REQUEST_MS
+        if threshold is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+        if elapsed * 1000 >= threshold:
+            entry = build_entry(request, response.status_code, elapsed,
+                                recorder)
+            logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+        return response
@@ -0,0 +1,81 @@
+"""Строгий режим шаблонов: запрет SQL-запросов во время рендеринга.
+
+Ленивые обращения к связям в шаблонах (post.location.name,
+comment.author.username) незаметно порождают запросы. При
+STRICT_TEMPLATE_QUERIES любой запрос во время рендеринга шаблона
+вызывает TemplateQueryError с именем шаблона и номером строки, так что
+все данные приходится загружать в представлениях и сервисах.
+Шаблоны админки не проверяются.
+"""
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+from .timing import measure_template
+
+EXEMPT_PREFIXES = ('admin/',)
+
+
+class TemplateQueryError(Exception):
+    """SQL-запрос во время рендеринга шаблона."""
+
+
+def forbid_queries(execute, sql, params, many, context):
+    raise TemplateQueryError(sql)
+
+
+class Template(DjangoTemplate):
+    """Шаблон с учётом времени рендеринга и строгим режимом."""
+
+    def render(self, context=None, request=None):
+        with measure_template():
+            return self.render_checked(context, request)
+
+    def render_checked(self, context, request):
+        name = self.template.origin.template_name or ''
+        if not settings.STRICT_TEMPLATE_QUERIES or name.startswith(
+            EXEMPT_PREFIXES
+        ):
+            return super().render(context, request)
+        if request is not None and hasattr(request, 'user'):
+            # Пользователь запроса загружается лениво; это не данные шаблона
+            request.user.pk
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(forbid_queries))
+            try:
+                return super().render(context, request)
+            except TemplateQueryError as error:
+                info = getattr(error, 'template_debug', None) or {
+                    'name': name, 'line': '?'
+                }
+                raise TemplateQueryError(
+                    f'SQL-запрос при рендеринге шаблона {info["name"]}, '
+                    f'строка {info["line"]}: {error.args[0]}'
+                ) from error
+
+
+class StrictQueriesDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд DjangoTemplates со строгим режимом.
+
+    В строгом режиме шаблоны компилируются с debug, чтобы ошибка знала
+    строку шаблона.
+    """
+
+    def __init__(self, params):
+        if settings.STRICT_TEMPLATE_QUERIES:
+            params = {**params, 'OPTIONS': {
+                'debug': True, **params.get('OPTIONS', {})
+            }}
+        super().__init__(params)
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return Template(template.template, self)
@@ -0,0 +1,76 @@
+"""Сбор времени обработки запроса по составляющим.
+
+RequestTimings собирает время SQL-запросов, рендеринга шаблонов и
+обращения к кэшу за один запрос. Текущий сборщик хранится в
+asgiref.local.Local, поэтому шаблоны и кэш отчитываются в него без
+передачи запроса.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.local import Local
+from django.db import connections
+
+_state = Local()
+
+
+class RequestTimings:
+    """Метрики одного запроса; время в секундах."""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.db_queries += 1
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        self.previous = get_current()
+        _state.timings = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _state.timings = self.previous
+        self.stack.close()
+
+
+def get_current():
+    """Сборщик текущего запроса или None."""
+    return getattr(_state, 'timings', None)
+
+
+@contextmanager
+def measure_template():
+    """Учитывает время рендеринга шаблона; вложенные шаблоны не суммируются."""
+    timings = get_current()
+    if timings is None:
+        yield
+        return
+    timings.template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.template_depth -= 1
+        if not timings.template_depth:
+            timings.template_time += time.perf_counter() - started
+
+
+def record_cache(hits, misses):
+    """Учитывает попадания и промахи кэша."""
+    timings = get_current()
+    if timings is not None:
+        timings.cache_hits += hits
+        timings.cache_misses += misses
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import re
 import time
@@ -32,6 +33,56 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def fail_on_n_plus_one():
+    with override_settings(N_PLUS_ONE_DETECTION="raise"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def search_index_in_tmp_path(tmp_path):
+    from blog.search import get_backend
+
+    get_backend.cache_clear()
+    with override_settings(
+        BLOG_SEARCH_INDEX_PATH=tmp_path / "search_index.sqlite3"
+    ):
+        yield
+    get_backend.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp_path(tmp_path, settings):
+    with override_settings(CACHES={
+        "default": {
+            **settings.CACHES["default"],
+            "LOCATION": tmp_path / "cache.sqlite3",
+        },
+    }):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def build_autocomplete_index_inline():
+    with override_settings(BLOG_AUTOCOMPLETE_BUILD_IN_THREAD=False):
+        yield
+
+
+@pytest.fixture
+def run_in_other_process():
+    """Runs a function in a forked process, like another worker would."""
+
+    def run(function, *args):
+        process = multiprocessing.get_context("fork").Process(
+            target=function, args=args
+        )
+        process.start()
+        process.join(30)
+        assert process.exitcode == 0
+
+    return run
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,43 @@
+import pytest
+from blog import bulk
+from blog.models import Category, Post
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    return mixer.cycle(7).blend(
+        "blog.Post", author=user, category=published_category
+    )
+
+
+@pytest.mark.django_db
+def test_set_published_updates_in_chunks(
+        many_posts, django_assert_max_num_queries
+):
+    chunks = 3
+    # На пачку: выборка ключей, UPDATE и точка сохранения транзакции
+    with django_assert_max_num_queries(chunks * 4 + 1):
+        changed = bulk.set_published(
+            Post.objects.all(), False, chunk_size=3
+        )
+    assert changed == len(many_posts)
+    assert not Post.objects.filter(is_visible=True).exists()
+
+    assert bulk.set_published(Post.objects.all(), True) == len(many_posts)
+    assert Post.objects.filter(is_visible=True).count() == len(many_posts)
+
+
+@pytest.mark.django_db
+def test_admin_unpublish_category_across_pages(
+        admin_client, many_posts, published_category
+):
+    response = admin_client.post("/admin/blog/category/", {
+        "action": "unpublish_selected",
+        "select_across": "1",
+        "index": "0",
+        ACTION_CHECKBOX_NAME: [published_category.pk],
+    })
+    assert response.status_code == 302
+    assert not Category.objects.get(pk=published_category.pk).is_published
+    assert not Post.objects.filter(is_visible=True).exists()
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def autocomplete(admin_client, model_name, field_name, term):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/autocomplete/", {
+            "app_label": "blog",
+            "model_name": model_name,
+            "field_name": field_name,
+            "term": term,
+        })
+    assert response.status_code == HTTPStatus.OK
+    return [item["text"] for item in response.json()["results"]], queries
+
+
+@pytest.mark.django_db
+def test_change_forms_do_not_render_related_rows(admin_client, mixer):
+    users = mixer.cycle(5).blend("auth.User")
+    for url in ("/admin/blog/post/add/", "/admin/blog/comment/add/"):
+        content = admin_client.get(url).content.decode()
+        assert "admin-autocomplete" in content, url
+        for user in users:
+            assert f">{user.username}<" not in content, url
+
+
+@pytest.mark.django_db
+def test_autocomplete_uses_prefix_range(admin_client, mixer):
+    mixer.blend("blog.Post", title="Zebra crossing")
+    mixer.blend("blog.Post", title="A zebra")
+    mixer.blend("auth.User", username="zebra_fan")
+
+    titles, queries = autocomplete(admin_client, "comment", "post", "zeb")
+    assert titles == ["Zebra crossing"]
+    search_sql = [
+        query["sql"] for query in queries.captured_queries
+        if '"blog_post"."title" >=' in query["sql"]
+    ]
+    assert search_sql and all("LIKE" not in sql for sql in search_sql)
+
+    usernames, _ = autocomplete(admin_client, "post", "author", "zeb")
+    assert usernames == ["zebra_fan"]
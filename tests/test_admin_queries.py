@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+from blog.paginators import EstimatedCountPaginator
+from blog.models import Post
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model_name", ["post", "comment"])
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client, mixer, model_name
+):
+    url = f"/admin/blog/{model_name}/"
+    mixer.cycle(2).blend(f"blog.{model_name}")
+    baseline = count_changelist_queries(admin_client, url)
+    mixer.cycle(10).blend(f"blog.{model_name}")
+    assert count_changelist_queries(admin_client, url) == baseline, (
+        "Число запросов страницы списка в админке растёт с числом строк."
+    )
+
+
+@pytest.mark.django_db
+def test_estimated_count_for_large_unfiltered_tables(
+        monkeypatch, mixer, published_category
+):
+    posts = mixer.cycle(3).blend("blog.Post", category=published_category)
+    monkeypatch.setattr("blog.paginators.ESTIMATED_COUNT_THRESHOLD", 1)
+    Post.objects.filter(pk=posts[0].pk).delete()
+
+    paginator = EstimatedCountPaginator(Post.objects.all(), 20)
+    assert paginator.count == max(post.pk for post in posts)
+
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(pk__in=[post.pk for post in posts]), 20
+    )
+    assert filtered.count == 2
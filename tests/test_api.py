@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        pub_date=(now - timedelta(hours=hour) for hour in range(1, 6)),
+    )
+
+
+@pytest.mark.django_db
+def test_api_post_list_cursor_pagination(client, api_posts):
+    seen = []
+    url = "/api/posts/?limit=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert all("text" not in item for item in data["results"])
+        seen += [item["id"] for item in data["results"]]
+        url = data["next"]
+    assert seen == [post.id for post in api_posts]
+
+
+@pytest.mark.django_db
+def test_api_sparse_fields_and_etag(client, api_posts):
+    response = client.get("/api/posts/", {"fields": "id,text"})
+    first = response.json()["results"][0]
+    assert first == {"id": api_posts[0].id, "text": api_posts[0].text}
+
+    etag = response["ETag"]
+    response = client.get(
+        "/api/posts/", {"fields": "id,text"}, HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = client.get("/api/posts/", {"fields": "id,password"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get("/api/posts/", {"cursor": "garbage"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_api_hides_unpublished_posts(
+        client, user_client, user, api_posts, posts_with_unpublished_category
+):
+    hidden = posts_with_unpublished_category[0]
+    response = client.get(f"/api/posts/{hidden.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    response = user_client.get(f"/api/posts/{hidden.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["text"] == hidden.text
+
+    anonymous_ids = {
+        item["id"]
+        for item in client.get(
+            f"/api/users/{user.username}/posts/?limit=100"
+        ).json()["results"]
+    }
+    author_ids = {
+        item["id"]
+        for item in user_client.get(
+            f"/api/users/{user.username}/posts/?limit=100"
+        ).json()["results"]
+    }
+    assert hidden.id not in anonymous_ids
+    assert hidden.id in author_ids
+
+
+@pytest.mark.django_db
+def test_api_comments_and_categories(
+        client, comment_to_a_post, published_category
+):
+    post_id = comment_to_a_post.post.id
+    response = client.get(f"/api/posts/{post_id}/comments/")
+    assert [item["id"] for item in response.json()["results"]] == [
+        comment_to_a_post.id
+    ]
+    slugs = [
+        item["slug"] for item in client.get("/api/categories/").json()[
+            "results"
+        ]
+    ]
+    assert published_category.slug in slugs
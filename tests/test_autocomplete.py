@@ -0,0 +1,161 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import autocomplete
+from blog.autocomplete import PrefixIndex
+from blog.caching import bump_version
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_prefix_index_matches_word_starts():
+    index = PrefixIndex()
+    index.add("post", 1, "Прогулка по Ёлкину лесу")
+    index.add("post", 2, "Лесные ягоды")
+    index.add("user", 3, "lesnik")
+    assert [pk for _, pk, _, _ in index.lookup("лес", 10)] == [2, 1]
+    assert [pk for _, pk, _, _ in index.lookup("елк", 10)] == [1]
+    index.remove("post", 2)
+    assert [pk for _, pk, _, _ in index.lookup("лес", 10)] == [1]
+    assert [pk for _, pk, _, _ in index.lookup("LES", 10)] == [3]
+
+
+def test_prefix_index_copies_share_keys_until_compacted(monkeypatch):
+    monkeypatch.setattr(autocomplete, "AUTOCOMPLETE_COMPACT_THRESHOLD", 2)
+    index = PrefixIndex.build([
+        ("post", 1, "Лесная тропа", {}),
+        ("post", 2, "Лесное озеро", {}),
+        ("user", 3, "lesnik", {}),
+    ])
+    copy = index.copy()
+    copy.add("post", 1, "Горная тропа")
+    copy.add("post", 4, "Лесной домик")
+    assert copy._keys is index._keys
+    assert [pk for _, pk, _, _ in index.lookup("лес", 10)] == [1, 2]
+    assert [pk for _, pk, _, _ in copy.lookup("лес", 10)] == [2, 4]
+    assert [pk for _, pk, _, _ in copy.lookup("тропа", 10)] == [1]
+
+    copy.remove("post", 2)
+    compacted = copy.copy()
+    assert compacted._keys is not index._keys
+    assert not compacted._changed
+    assert ("post", 2) not in compacted
+    for current in (copy, compacted):
+        assert [pk for _, pk, _, _ in current.lookup("л", 10)] == [4]
+        assert [pk for _, pk, _, _ in current.lookup("гор", 10)] == [1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_index_is_rebuilt_in_background(mixer, settings):
+    settings.BLOG_AUTOCOMPLETE_BUILD_IN_THREAD = True
+    mixer.blend("auth.User", username="otter")
+    other = autocomplete.LocalIndex()
+    assert other.get().lookup("ott", 10) == []
+    other.thread.join()
+    assert [label for _, _, label, _ in other.get().lookup("ott", 10)] == [
+        "otter"
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_autocomplete_endpoint(
+        mixer, client, published_category, django_assert_num_queries
+):
+    post = mixer.blend(
+        "blog.Post", title="Zebra crossing", category=published_category
+    )
+    mixer.blend(
+        "blog.Post", title="Zebra hidden", category=published_category,
+        is_published=False,
+    )
+    mixer.blend(
+        "blog.Post", title="Zebra future", category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    mixer.blend("auth.User", username="zebra_fan")
+    client.get("/autocomplete/", {"q": "zeb"})
+
+    with django_assert_num_queries(0):
+        response = client.get("/autocomplete/", {"q": "zeb"})
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()["results"]
+    assert {item["label"] for item in results} == {
+        "Zebra crossing", "zebra_fan"
+    }
+    assert f"/posts/{post.id}/" in {item["url"] for item in results}
+
+    post.title = "Horse crossing"
+    post.save()
+    labels = {
+        item["label"]
+        for item in client.get("/autocomplete/", {"q": "zeb"}).json()[
+            "results"
+        ]
+    }
+    assert labels == {"zebra_fan"}
+
+
+@pytest.mark.django_db
+def test_other_processes_apply_deltas_without_rebuild(
+        mixer, django_assert_num_queries
+):
+    mixer.blend("auth.User", username="walrus")
+    other = autocomplete.LocalIndex()
+    old_index = other.get()
+    snapshot_version = cache.get(autocomplete.SNAPSHOT_KEY)[0]
+
+    autocomplete.update_index(autocomplete.USER, 10_001, "wombat")
+    autocomplete.update_index(autocomplete.USER, 10_002, "wolverine")
+    autocomplete.update_index(autocomplete.USER, 10_001)
+
+    with django_assert_num_queries(0):
+        labels = [label for _, _, label, _ in other.get().lookup("w", 10)]
+    assert labels == ["walrus", "wolverine"]
+    assert [label for _, _, label, _ in old_index.lookup("w", 10)] == [
+        "walrus"
+    ]
+    assert cache.get(autocomplete.SNAPSHOT_KEY)[0] == snapshot_version
+
+
+@pytest.mark.django_db
+def test_version_bump_without_delta_rebuilds_from_database(mixer):
+    other = autocomplete.LocalIndex()
+    other.get()
+    mixer.blend("auth.User", username="narwhal")
+    bump_version(autocomplete.NAMESPACE)
+    assert [label for _, _, label, _ in other.get().lookup("narw", 10)] == [
+        "narwhal"
+    ]
+
+
+def assert_snapshot_has_no_queries(label):
+    with CaptureQueriesContext(connection) as queries:
+        index = autocomplete.LocalIndex().get()
+    assert not queries.captured_queries
+    assert index.lookup(label, 1)
+
+
+@pytest.mark.django_db
+def test_deltas_and_snapshot_are_shared_between_processes(
+        mixer, run_in_other_process, django_assert_num_queries
+):
+    mixer.blend("auth.User", username="walrus")
+    local = autocomplete.LocalIndex()
+    local.get()
+    run_in_other_process(assert_snapshot_has_no_queries, "walrus")
+    run_in_other_process(
+        autocomplete.update_index, autocomplete.USER, 10_001, "wombat"
+    )
+    with django_assert_num_queries(0):
+        labels = [label for _, _, label, _ in local.get().lookup("w", 10)]
+    assert labels == ["walrus", "wombat"]
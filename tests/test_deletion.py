@@ -0,0 +1,88 @@
+import pytest
+from blog import autocomplete, deletion, feeds, signals
+from blog.models import Comment, DeletionJob, Post
+from django.core.management import call_command
+
+
+@pytest.fixture
+def small_limits(monkeypatch, settings):
+    settings.BLOG_DELETION_IN_THREAD = False
+    monkeypatch.setattr(deletion, "DELETION_INLINE_LIMIT", 2)
+    monkeypatch.setattr(deletion, "DELETION_CHUNK_SIZE", 2)
+
+
+def add_comments(mixer, post, count):
+    mixer.cycle(count).blend("blog.Comment", post=post, author=post.author)
+
+
+@pytest.mark.django_db
+def test_small_post_deleted_inline(
+        small_limits, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    add_comments(mixer, post, 2)
+    assert deletion.delete_post(post) is None
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not DeletionJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_large_post_hidden_then_deleted_in_chunks(
+        small_limits, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    add_comments(mixer, post, 5)
+    job = deletion.delete_post(post)
+    assert job is not None
+    assert not Post.objects.get(pk=post.pk).is_visible
+    assert Comment.objects.filter(post=post).count() == 5
+
+    deletion.run_job(job.pk)
+    job.refresh_from_db()
+    assert job.status == DeletionJob.DONE
+    assert (job.deleted, job.total) == (5, 5)
+    assert not Post.objects.filter(pk=post.pk).exists()
+
+
+@pytest.mark.django_db
+def test_large_user_deactivated_and_command_resumes_job(
+        small_limits, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    add_comments(mixer, post, 3)
+    job = deletion.delete_user(post.author)
+    author = type(post.author).objects.get(pk=post.author.pk)
+    assert not author.is_active
+    assert not Post.objects.get(pk=post.pk).is_visible
+
+    DeletionJob.objects.filter(pk=job.pk).update(status=DeletionJob.RUNNING)
+    call_command("process_deletion_jobs", include_running=True)
+    job.refresh_from_db()
+    assert job.status == DeletionJob.DONE
+    assert not type(author).objects.filter(pk=author.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_job_invalidates_autocomplete_and_feeds_once(
+        small_limits, monkeypatch, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Post", author=post.author,
+                         category=post.category)
+    add_comments(mixer, post, 3)
+    job = deletion.delete_user(post.author)
+
+    updates = []
+    monkeypatch.setattr(autocomplete, "update_index",
+                        lambda *args, **kwargs: updates.append(args))
+    monkeypatch.setattr(signals, "bump_version", updates.append)
+    bumps = []
+    monkeypatch.setattr(deletion, "bump_version", bumps.append)
+    deletion.run_job(job.pk)
+
+    assert not Post.objects.filter(author_id=post.author_id).exists()
+    assert updates == []
+    assert sorted(bumps) == sorted(
+        [autocomplete.NAMESPACE, feeds.NAMESPACE] * 2
+    )
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from blog import feeds
+from blog.caching import bump_version
+from blog.models import Post
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feeds_are_served_from_cache(
+        client, user, post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    category_slug = post.category.slug
+    urls = (
+        "/feed/",
+        "/feed/atom/",
+        f"/category/{category_slug}/feed/",
+        f"/category/{category_slug}/feed/atom/",
+        f"/profile/{post.author.username}/feed/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        assert post.title in response.content.decode(), url
+
+        with django_assert_num_queries(0):
+            cached = client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, url
+
+        with django_assert_num_queries(0):
+            cached = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, url
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_invalidated_on_post_change(client, post_with_published_location):
+    post = post_with_published_location
+    etag = client.get("/feed/")["ETag"]
+    post.title = "Совсем новый заголовок"
+    post.save()
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Совсем новый заголовок" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_invalidated_by_other_worker(
+        client, post_with_published_location, run_in_other_process
+):
+    post = post_with_published_location
+    etag = client.get("/feed/")["ETag"]
+    # The post is saved by another worker, which bumps the feed version
+    # in its own process.
+    Post.objects.filter(pk=post.pk).update(title="Из другого процесса")
+    run_in_other_process(bump_version, feeds.NAMESPACE)
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Из другого процесса" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_missing_category_feed(client):
+    response = client.get("/category/no-such-category/feed/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,71 @@
+from io import StringIO
+
+import pytest
+from blog.models import Category, Comment, Location, Post
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Max
+from django.utils import timezone
+
+N_POSTS = 400
+
+
+def generate(**options):
+    out = StringIO()
+    call_command("generate_dataset", stdout=out, **options)
+    return out.getvalue()
+
+
+def post_fingerprint(prefix):
+    return list(
+        Post.objects.filter(
+            author__username__startswith=prefix
+        ).order_by("pk").values_list("title", "text", "is_published",
+                                     "category__title")
+    )
+
+
+@pytest.mark.django_db
+def test_generate_dataset_counts_and_shape():
+    output = generate(posts=N_POSTS, users=20, categories=4, locations=6,
+                      comments=2_000, unpublished=0.2, future=0.1,
+                      batch_size=64)
+    assert "постов 400" in output
+    assert get_user_model().objects.filter(
+        username__startswith="synthetic"
+    ).count() == 20
+    assert Category.objects.count() == 4
+    assert Location.objects.count() == 6
+    assert Post.objects.count() == N_POSTS
+    assert Comment.objects.count() == 2_000
+
+    unpublished = Post.objects.filter(is_published=False).count()
+    assert 0.1 * N_POSTS < unpublished < 0.3 * N_POSTS
+    future = Post.objects.filter(pub_date__gt=timezone.now()).count()
+    assert 0 < future < 0.2 * N_POSTS
+    for post in Post.objects.select_related("category"):
+        assert post.is_visible == (
+            post.is_published and post.category.is_published
+        )
+
+    busiest = Post.objects.annotate(
+        comment_count=Count("comments")
+    ).aggregate(busiest=Max("comment_count"))["busiest"]
+    assert busiest > 10 * 2_000 / N_POSTS
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_deterministic():
+    generate(posts=50, seed=7, prefix="first", skip_search_index=True)
+    generate(posts=50, seed=7, prefix="second", skip_search_index=True)
+    generate(posts=50, seed=8, prefix="third", skip_search_index=True)
+    assert post_fingerprint("first") == post_fingerprint("second")
+    assert post_fingerprint("first") != post_fingerprint("third")
+
+
+@pytest.mark.django_db
+def test_generate_dataset_rejects_existing_prefix():
+    generate(posts=10)
+    with pytest.raises(CommandError, match="synthetic0"):
+        generate(posts=10)
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from blog import lookups
+from blog.caching import bump_version
+from blog.models import Category
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_feeds_read_categories_and_locations_from_memory(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    for url in ("/", f"/category/{post.category.slug}/", f"/posts/{post.id}/"):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        assert post.location.name in response.content.decode(), url
+        for query in queries.captured_queries:
+            assert "blog_category" not in query["sql"], url
+            assert "blog_location" not in query["sql"], url
+
+
+@pytest.mark.django_db
+def test_lookups_invalidated_on_category_change(
+        client, post_with_published_location
+):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    category.is_published = False
+    category.save()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert post_with_published_location.title not in (
+        client.get("/").content.decode()
+    )
+
+
+@pytest.mark.django_db
+def test_category_change_in_other_worker_invalidates_lookups(
+        client, post_with_published_location, run_in_other_process
+):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    assert client.get(url).status_code == HTTPStatus.OK
+    # Another worker saves the category: the row changes and its signal
+    # bumps the version in that worker's process, not in this one.
+    Category.objects.filter(pk=category.pk).update(is_published=False)
+    run_in_other_process(bump_version, lookups.NAMESPACE)
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,38 @@
+import json
+import tracemalloc
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def memory_profile(settings, tmp_path):
+    settings.MEMORY_PROFILE_SAMPLE_RATE = 1
+    settings.MEMORY_PROFILE_PATH = tmp_path / "memory.jsonl"
+    yield settings.MEMORY_PROFILE_PATH
+    tracemalloc.stop()
+
+
+@pytest.mark.django_db
+def test_memory_profile_and_report(
+        memory_profile, client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(20).blend("blog.Comment", post=post, author=post.author)
+    client.get(f"/posts/{post.id}/")
+    client.get("/pages/about/")
+
+    assert not tracemalloc.is_tracing()
+
+    records = [json.loads(line) for line in memory_profile.open()]
+    assert [record["view"] for record in records] == [
+        "blog:post_detail", "pages:about"
+    ]
+    assert records[0]["peak"] > 0
+    assert records[0]["top"] and records[0]["top"][0]["size"] > 0
+
+    out = StringIO()
+    call_command("memory_report", path=str(memory_profile), stdout=out)
+    assert "blog:post_detail" in out.getvalue()
+    assert "Профилей: 2." in out.getvalue()
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from monitoring.metrics import MetricsRegistry, registry
+
+TOKEN = "metrics-token"
+
+
+@pytest.fixture(autouse=True)
+def metrics_store(settings, tmp_path):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = TOKEN
+    settings.METRICS_DB_PATH = tmp_path / "metrics.sqlite3"
+    settings.METRICS_FLUSH_INTERVAL = 0
+    registry.increments.clear()
+    registry.gauges.clear()
+
+
+def get_samples(client):
+    response = client.get("/metrics/", HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+    assert response.status_code == HTTPStatus.OK
+    return dict(
+        line.rsplit(" ", 1)
+        for line in response.content.decode().splitlines()
+        if not line.startswith("#")
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client, post_with_published_location):
+    client.get("/")
+    client.get("/feed/")
+    client.get("/feed/")
+    samples = get_samples(client)
+
+    index = 'method="GET",status="200",view="blog:index"'
+    assert samples[f"blogicum_requests_total{{{index}}}"] == "1"
+    assert samples[
+        'blogicum_request_duration_seconds_bucket{le="+Inf",view="blog:index"}'
+    ] == "1"
+    assert int(samples['blogicum_db_queries_total{view="blog:index"}']) > 0
+    assert int(samples[
+        'blogicum_cache_requests_total{namespace="blog:feed",result="hit"}'
+    ]) > 0
+    assert any(
+        name.startswith("process_resident_memory_bytes") for name in samples
+    )
+    assert any(name.startswith("blogicum_queue_depth") for name in samples)
+    assert samples['blogicum_deletion_jobs{status="pending"}'] == "0"
+
+
+@pytest.mark.django_db
+def test_metrics_aggregated_across_processes(client):
+    client.get("/pages/about/")
+    other_process = MetricsRegistry()
+    other_process.inc(
+        "blogicum_requests_total",
+        {"view": "pages:about", "method": "GET", "status": 200},
+    )
+    other_process.flush()
+    samples = get_samples(client)
+    assert samples[
+        'blogicum_requests_total{method="GET",status="200",view="pages:about"}'
+    ] == "2"
+
+
+@pytest.mark.django_db
+def test_metrics_forbidden_without_token(client, settings):
+    # Запросы через локальный обратный прокси приходят с 127.0.0.1
+    assert client.get("/metrics/").status_code == HTTPStatus.FORBIDDEN
+    assert client.get(
+        "/metrics/", HTTP_AUTHORIZATION="Bearer wrong"
+    ).status_code == HTTPStatus.FORBIDDEN
+    settings.METRICS_TOKEN = ""
+    assert client.get(
+        "/metrics/", HTTP_AUTHORIZATION="Bearer "
+    ).status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_metrics_allowed_for_staff_and_listed_addresses(
+        admin_client, client, settings
+):
+    assert admin_client.get("/metrics/").status_code == HTTPStatus.OK
+    settings.METRICS_ALLOWED_IPS = ["10.0.0.5"]
+    assert client.get(
+        "/metrics/", REMOTE_ADDR="10.0.0.5"
+    ).status_code == HTTPStatus.OK
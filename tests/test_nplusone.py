@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from blog.admin import PostAdmin
+from blog.models import Post
+from monitoring.nplusone import NPlusOneDetector, NPlusOneError, normalize
+
+N_POSTS = 12
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(N_POSTS).blend(
+        "blog.Post", category=published_category,
+        location=published_location
+    )
+    for post in posts[:2]:
+        mixer.cycle(N_POSTS).blend("blog.Comment", post=post)
+    return posts
+
+
+def test_normalize_collapses_in_lists():
+    assert normalize("SELECT 1 WHERE id IN (%s, %s,\n %s)") == (
+        "SELECT 1 WHERE id IN (...)"
+    )
+    assert normalize("SELECT 1 WHERE id IN (%s)") == (
+        "SELECT 1 WHERE id IN (...)"
+    )
+
+
+@pytest.mark.django_db
+def test_detector_flags_lazy_relations(many_posts):
+    with NPlusOneDetector() as detector:
+        for post in Post.objects.all():
+            post.author.username
+    problems = detector.get_problems()
+    assert len(problems) == 1
+    assert f"{N_POSTS} запросов вида" in problems[0]
+    assert "auth_user" in problems[0]
+
+    with NPlusOneDetector() as detector:
+        for post in Post.objects.select_related("author"):
+            post.author.username
+    assert detector.get_problems() == []
+
+
+@pytest.mark.django_db
+def test_blog_pages_have_no_n_plus_one(client, many_posts):
+    post = many_posts[0]
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+        "/feed/",
+        "/sitemap.xml",
+    ):
+        assert client.get(url).status_code == HTTPStatus.OK, url
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model_name", ["post", "comment", "category",
+                                        "location"])
+def test_admin_changelists_have_no_n_plus_one(
+        admin_client, many_posts, model_name
+):
+    response = admin_client.get(f"/admin/blog/{model_name}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_lost_select_related_is_reported_with_template(
+        client, monkeypatch, many_posts
+):
+    monkeypatch.setattr(
+        "blog.views.filter_and_annotate_posts",
+        lambda queryset, filter_published=True: queryset.order_by("-pub_date")
+    )
+    with pytest.raises(NPlusOneError) as error:
+        client.get("/")
+    message = str(error.value)
+    assert "GET /" in message
+    assert "код blog/views.py" in message
+    assert "includes/post_card.html, строка" in message
+
+
+@pytest.mark.django_db
+def test_admin_without_list_select_related_is_reported(
+        admin_client, monkeypatch, many_posts
+):
+    monkeypatch.setattr(PostAdmin, "list_select_related", False)
+    with pytest.raises(NPlusOneError):
+        admin_client.get("/admin/blog/post/")
+
+
+@pytest.mark.django_db
+def test_warn_mode_does_not_break_response(
+        client, monkeypatch, settings, many_posts
+):
+    settings.N_PLUS_ONE_DETECTION = "warn"
+    monkeypatch.setattr(
+        "blog.views.filter_and_annotate_posts",
+        lambda queryset, filter_published=True: queryset.order_by("-pub_date")
+    )
+    with pytest.warns(UserWarning, match="N\\+1"):
+        response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
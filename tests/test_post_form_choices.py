@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from blog.forms import PostForm
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+def lookup_queries(queries):
+    return [
+        query["sql"] for query in queries.captured_queries
+        if "blog_category" in query["sql"] or "blog_location" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_post_form_choices_come_from_cache(
+        mixer, published_category, published_location
+):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    PostForm().as_p()
+
+    with CaptureQueriesContext(connection) as queries:
+        form = PostForm(data={
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+            "category": published_category.id,
+            "location": published_location.id,
+        })
+        html = form.as_p()
+        assert form.is_valid(), form.errors
+    assert not lookup_queries(queries)
+    assert f'value="{published_category.id}"' in html
+    assert f'value="{hidden_category.id}"' not in html
+    assert form.cleaned_data["category"] == published_category
+
+    form = PostForm(data={"category": hidden_category.id})
+    assert "category" in form.errors
+
+
+@pytest.mark.django_db
+def test_post_delete_page_builds_no_form(
+        user_client, post_with_published_location
+):
+    response = user_client.get(
+        f"/posts/{post_with_published_location.id}/delete/"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert not isinstance(response.context["form"], PostForm)
+    assert post_with_published_location.title in response.content.decode()
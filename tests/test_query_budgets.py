@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.urls import get_resolver
+from django.utils import timezone
+from monitoring.budgets import QUERY_BUDGETS, QueryBudgetExceeded
+
+N_POSTS = 5
+N_COMMENTS = 3
+
+
+@pytest.fixture(autouse=True)
+def strict_budgets(settings):
+    settings.QUERY_BUDGET_MODE = "raise"
+
+
+@pytest.fixture
+def page_data(mixer, user, published_category, published_location):
+    posts = mixer.cycle(N_POSTS).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location
+    )
+    for post in posts:
+        mixer.cycle(N_COMMENTS).blend("blog.Comment", post=post, author=user)
+    return posts[0], posts[0].comments.first(), published_category
+
+
+def get_urls(user, post, comment, category):
+    return {
+        "blog:index": "/",
+        "blog:post_detail": f"/posts/{post.id}/",
+        "blog:create_post": "/posts/create/",
+        "blog:edit_post": f"/posts/{post.id}/edit/",
+        "blog:delete_post": f"/posts/{post.id}/delete/",
+        "blog:category_posts": f"/category/{category.slug}/",
+        "blog:edit_comment": f"/posts/{post.id}/edit_comment/{comment.id}/",
+        "blog:delete_comment": (
+            f"/posts/{post.id}/delete_comment/{comment.id}/"
+        ),
+        "blog:edit_profile": "/profile/edit/",
+        "blog:profile": f"/profile/{user.username}/",
+        "blog:feed": "/feed/",
+        "blog:feed_atom": "/feed/atom/",
+        "blog:category_feed": f"/category/{category.slug}/feed/",
+        "blog:category_feed_atom": f"/category/{category.slug}/feed/atom/",
+        "blog:profile_feed": f"/profile/{user.username}/feed/",
+        "blog:profile_feed_atom": f"/profile/{user.username}/feed/atom/",
+        "blog:sitemap": "/sitemap.xml",
+        "blog:sitemap_section": "/sitemap-posts-1.xml",
+        "blog:autocomplete": "/autocomplete/?q=a",
+        "pages:about": "/pages/about/",
+        "pages:rules": "/pages/rules/",
+    }
+
+
+def test_every_route_has_budget():
+    resolver = get_resolver()
+    names = {
+        f"{namespace}:{pattern.name}"
+        for namespace in ("blog", "pages")
+        for pattern in resolver.namespace_dict[namespace][1].url_patterns
+    }
+    assert names <= set(QUERY_BUDGETS), (
+        f"Задайте бюджет запросов для {sorted(names - set(QUERY_BUDGETS))}"
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("authorized", [False, True])
+def test_get_requests_fit_budgets(
+        client, user_client, user, page_data, authorized
+):
+    urls = get_urls(user, *page_data)
+    for view_name, url in urls.items():
+        if view_name == "blog:add_comment":
+            continue
+        cache.clear()
+        (user_client if authorized else client).get(url)
+
+
+@pytest.mark.django_db
+def test_post_requests_fit_budgets(user_client, user, page_data):
+    post, comment, category = page_data
+    post_data = {
+        "title": "Новый заголовок",
+        "text": "Текст",
+        "pub_date": timezone.localtime().strftime("%Y-%m-%dT%H:%M"),
+        "category": category.id,
+    }
+    requests = (
+        ("/posts/create/", post_data),
+        (f"/posts/{post.id}/edit/", post_data),
+        (f"/posts/{post.id}/comment/", {"text": "Комментарий"}),
+        (f"/posts/{post.id}/edit_comment/{comment.id}/", {"text": "Правка"}),
+        (f"/posts/{post.id}/delete_comment/{comment.id}/", {}),
+        (f"/posts/{post.id}/delete/", {}),
+    )
+    for url, data in requests:
+        cache.clear()
+        response = user_client.post(url, data)
+        assert response.status_code == HTTPStatus.FOUND, url
+
+
+@pytest.mark.django_db
+def test_exceeded_budget_raises_or_logs(
+        monkeypatch, settings, caplog, user_client
+):
+    monkeypatch.setitem(QUERY_BUDGETS, "pages:about", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get("/pages/about/")
+
+    settings.QUERY_BUDGET_MODE = "log"
+    assert user_client.get("/pages/about/").status_code == HTTPStatus.OK
+    assert "при бюджете 0" in caplog.text
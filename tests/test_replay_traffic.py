@@ -0,0 +1,96 @@
+import json
+from io import StringIO
+
+import pytest
+from blog.models import Comment
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from monitoring.replay import (ReplayError, load_records, partition,
+                               percentile)
+
+
+def write_log(path, records):
+    path.write_text(
+        "\n".join(json.dumps(record) for record in records) + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_load_records_defaults_and_errors():
+    records = load_records(['{"path": "/"}', "", '{"method": "post", '
+                            '"path": "/x/", "user": "a", "think": 0.5}'])
+    assert records == [
+        {"method": "GET", "path": "/", "user": None, "think": 0.0,
+         "data": {}},
+        {"method": "POST", "path": "/x/", "user": "a", "think": 0.5,
+         "data": {}},
+    ]
+    with pytest.raises(ReplayError, match="Строка 1"):
+        load_records(['{"method": "GET"}'])
+
+
+def test_partition_keeps_each_user_in_one_ordered_stream():
+    records = [
+        {"path": f"/{number}/", "user": user}
+        for number, user in enumerate(
+            ["a", None, "b", "a", None, "a", "c", None, "b", None]
+        )
+    ]
+    streams = partition(records, 3)
+    assert sorted(
+        record["path"] for stream in streams for record in stream
+    ) == sorted(record["path"] for record in records)
+    for user in ("a", "b", "c"):
+        owners = [
+            stream for stream in streams
+            if any(record["user"] == user for record in stream)
+        ]
+        assert len(owners) == 1
+    for stream in streams:
+        paths = [int(record["path"].strip("/")) for record in stream]
+        assert paths == sorted(paths)
+    assert sorted(len(stream) for stream in streams) == [3, 3, 4]
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replay_traffic(tmp_path, user, post_with_published_location):
+    post = post_with_published_location
+    log = write_log(tmp_path / "traffic.jsonl", [
+        {"path": "/"},
+        {"path": f"/posts/{post.id}/", "think": 0.01},
+        {"path": "/profile/edit/", "user": user.username},
+        {"method": "POST", "path": f"/posts/{post.id}/comment/",
+         "user": user.username, "data": {"text": "Из журнала"}},
+        {"path": "/posts/999999/"},
+    ])
+    output = tmp_path / "summary.json"
+    out = StringIO()
+    call_command("replay_traffic", str(log), workers=2, repeat=2,
+                 output=str(output), stdout=out)
+
+    summary = json.loads(output.read_text(encoding="utf-8"))
+    assert summary["requests"] == 10
+    assert summary["errors"] == 0
+    assert summary["statuses"] == {"200": 6, "302": 2, "404": 2}
+    assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
+    assert summary["views"]["GET blog:post_detail"]["requests"] == 4
+    assert Comment.objects.filter(text="Из журнала").count() == 2
+    assert not Session.objects.exists()
+    assert "Прогон завершён." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_replay_traffic_unknown_user(tmp_path):
+    log = write_log(tmp_path / "traffic.jsonl",
+                    [{"path": "/", "user": "nobody"}])
+    with pytest.raises(CommandError, match="nobody"):
+        call_command("replay_traffic", str(log), stdout=StringIO())
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+from blog import autocomplete, feeds
+from blog.caching import VersionedLocalCache
+from blog.models import Post
+from blogicum.replication import copy_database
+from blogicum.routing import (PIN_COOKIE, ReadReplicaRouter,
+                              ReplicaPinMiddleware, read_from_primary,
+                              use_replicas)
+from django.http import HttpResponse
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    yield
+    use_replicas(False)
+
+
+def make_middleware(write=False):
+    router = ReadReplicaRouter()
+    seen = []
+
+    def get_response(request):
+        seen.append(router.db_for_read(Post))
+        if write:
+            router.db_for_write(Post)
+            seen.append(router.db_for_read(Post))
+        return HttpResponse()
+
+    return ReplicaPinMiddleware(get_response), seen
+
+
+def test_reads_outside_requests_use_primary(replicas):
+    assert ReadReplicaRouter().db_for_read(Post) == "default"
+
+
+def test_safe_request_reads_from_replica(replicas, rf):
+    middleware, seen = make_middleware()
+    response = middleware(rf.get("/"))
+    assert seen == ["replica_1"]
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_write_pins_client_to_primary(replicas, rf):
+    middleware, seen = make_middleware(write=True)
+    response = middleware(rf.get("/"))
+    assert seen == ["replica_1", "default"]
+    assert PIN_COOKIE in response.cookies
+
+    middleware, seen = make_middleware()
+    request = rf.get("/")
+    request.COOKIES[PIN_COOKIE] = "1"
+    middleware(request)
+    assert seen == ["default"]
+
+
+def test_unsafe_request_reads_from_primary(replicas, rf):
+    middleware, seen = make_middleware()
+    middleware(rf.post("/"))
+    assert seen == ["default"]
+
+
+def test_cache_loaders_read_from_primary(replicas, monkeypatch):
+    router = ReadReplicaRouter()
+    seen = []
+
+    def loader(*args):
+        seen.append(router.db_for_read(Post))
+        return autocomplete.PrefixIndex()
+
+    monkeypatch.setattr(feeds, "build_payload", loader)
+    monkeypatch.setattr(autocomplete, "build_index", loader)
+    use_replicas(True)
+    VersionedLocalCache("routing-test", loader).get()
+    feeds.get_payload("index")
+    autocomplete.load_index(0)
+    assert seen == ["default"] * 3
+    assert router.db_for_read(Post) == "replica_1"
+
+
+def test_write_inside_primary_block_keeps_primary(replicas):
+    router = ReadReplicaRouter()
+    use_replicas(True)
+    with read_from_primary():
+        router.db_for_write(Post)
+    assert router.db_for_read(Post) == "default"
+
+
+def test_copy_database(tmp_path):
+    source = tmp_path / "source.sqlite3"
+    target = tmp_path / "target.sqlite3"
+    connection = sqlite3.connect(source)
+    connection.execute("CREATE TABLE post (title TEXT)")
+    connection.execute("INSERT INTO post VALUES ('Первый')")
+    connection.commit()
+    copy_database(source, target)
+    connection.execute("INSERT INTO post VALUES ('Второй')")
+    connection.commit()
+    connection.close()
+
+    replica = sqlite3.connect(target)
+    assert replica.execute("SELECT title FROM post").fetchall() == [
+        ("Первый",)
+    ]
+    replica.close()
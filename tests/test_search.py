@@ -0,0 +1,71 @@
+import pytest
+from blog.models import Comment, Post
+from blog.search import search
+from blog.search.inverted import InvertedIndexSearchBackend
+from blog.search.text import analyze
+
+
+@pytest.fixture
+def inverted_backend(tmp_path):
+    return InvertedIndexSearchBackend(tmp_path / "index.sqlite3")
+
+
+def test_analyze_stems_russian_words():
+    assert analyze("Публикации о котах") == analyze("публикация кот"), (
+        "Убедитесь, что словоформы русских слов приводятся к одной основе,"
+        " а стоп-слова отбрасываются."
+    )
+    assert analyze("Ёлка") == analyze("елка")
+
+
+@pytest.mark.django_db
+def test_inverted_index_ranks_with_bm25(mixer, inverted_backend):
+    relevant = mixer.blend(
+        Post, title="Коты", text="Коты и котята: всё о котах."
+    )
+    other = mixer.blend(Post, title="Собаки", text="Про собак и одного кота.")
+    mixer.blend(Post, title="Погода", text="Сегодня солнечно.")
+    inverted_backend.rebuild([Post])
+
+    assert inverted_backend.search(Post, "кот", 10) == [
+        relevant.id, other.id
+    ]
+    assert inverted_backend.search(Post, "собака", 10) == [other.id]
+    assert inverted_backend.search(Post, "и", 10) == []
+
+
+@pytest.mark.django_db
+def test_inverted_index_incremental_updates(mixer, inverted_backend):
+    comment = mixer.blend(Comment, text="Отличная публикация")
+    inverted_backend.index(comment)
+    assert inverted_backend.search(Comment, "публикации", 10) == [comment.id]
+
+    comment.text = "Отличный рассказ"
+    inverted_backend.index(comment)
+    assert inverted_backend.search(Comment, "публикации", 10) == []
+    assert inverted_backend.search(Comment, "рассказы", 10) == [comment.id]
+
+    inverted_backend.remove(Comment, comment.id)
+    assert inverted_backend.search(Comment, "рассказы", 10) == []
+
+
+@pytest.mark.django_db
+def test_search_uses_configured_backend(mixer, settings):
+    post = mixer.blend(Post, title="Путешествие на Алтай")
+    mixer.blend(Post, title="Рецепт пирога")
+    assert list(search(Post.objects.all(), "алтай")) == [post]
+    assert not search(Post.objects.all(), "   ").exists()
+
+
+@pytest.mark.django_db
+def test_search_limit_counts_only_matching_objects(mixer):
+    hidden = mixer.cycle(5).blend(
+        Post, title="Алтай", is_published=False
+    )
+    visible = mixer.cycle(3).blend(Post, title="Алтай летом")
+    queryset = Post.objects.filter(is_published=True)
+    found = list(search(queryset, "алтай", limit=2))
+    assert len(found) == 2
+    assert set(found) <= set(visible)
+    assert set(search(queryset, "алтай", limit=10)) == set(visible)
+    assert not set(search(queryset, "алтай")) & set(hidden)
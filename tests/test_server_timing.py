@@ -0,0 +1,41 @@
+import pstats
+import re
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_server_timing_header(settings, client, post_with_published_location):
+    settings.SERVER_TIMING = True
+    header = client.get("/")["Server-Timing"]
+    metrics = dict(
+        re.match(r"(\w+);(.*)", part).groups() for part in header.split(", ")
+    )
+    assert set(metrics) == {"total", "view", "tpl", "db", "cache"}
+    assert re.search(r'desc="[1-9]\d* queries"', metrics["db"])
+    assert float(re.match(r"dur=([\d.]+)", metrics["tpl"]).group(1)) > 0
+
+    cache_header = client.get("/feed/")["Server-Timing"]
+    assert "hits=" in cache_header and "misses=" in cache_header
+
+
+@pytest.mark.django_db
+def test_profile_dumped_for_trigger_header(settings, client, tmp_path):
+    settings.PROFILE_TRIGGER_TOKEN = "secret"
+    settings.PROFILE_DIR = tmp_path
+    client.get("/pages/about/")
+    client.get("/pages/about/", HTTP_X_PROFILE="wrong")
+    assert not list(tmp_path.iterdir())
+
+    client.get("/pages/about/", HTTP_X_PROFILE="secret")
+    (profile,) = tmp_path.iterdir()
+    assert profile.suffix == ".pstats"
+    assert pstats.Stats(str(profile)).total_calls > 0
+
+
+@pytest.mark.django_db
+def test_sampled_profiling(settings, client, tmp_path):
+    settings.PROFILE_SAMPLE_RATE = 1.0
+    settings.PROFILE_DIR = tmp_path
+    client.get("/pages/rules/")
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,45 @@
+import pytest
+from blog.caching import bump_version, get_version
+from blogicum.cache import SQLiteCache
+from django.core.cache import cache
+
+
+def test_sqlite_cache_operations():
+    assert cache.get("missing", "default") == "default"
+    cache.set("key", {"a": 1})
+    assert cache.get("key") == {"a": 1}
+    assert not cache.add("key", "other")
+    assert cache.add("new", 1)
+    assert cache.incr("new", 2) == 3
+    with pytest.raises(ValueError):
+        cache.incr("absent")
+    cache.set("expired", 1, timeout=0)
+    assert cache.get("expired") is None
+    assert cache.add("expired", 2)
+    assert cache.get_many(["key", "new", "absent"]) == {
+        "key": {"a": 1}, "new": 3
+    }
+    assert cache.delete("key")
+    assert not cache.has_key("key")
+
+
+def test_version_bumps_from_other_processes_are_counted(
+        run_in_other_process
+):
+    before = get_version("shared-test")
+    for _ in range(3):
+        run_in_other_process(bump_version, "shared-test")
+    assert get_version("shared-test") == before + 3
+
+
+def test_sqlite_cache_culls_expiring_entries_first(tmp_path):
+    backend = SQLiteCache(
+        tmp_path / "culled.sqlite3",
+        {"OPTIONS": {"MAX_ENTRIES": 4, "CULL_FREQUENCY": 2}},
+    )
+    backend.set("forever", 1, timeout=None)
+    for number in range(5):
+        backend.set(f"short-{number}", number, timeout=60 + number)
+    assert backend.get("forever") == 1
+    assert backend.get("short-4") == 4
+    assert backend.get("short-0") is None
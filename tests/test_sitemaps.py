@@ -0,0 +1,89 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from blog import sitemaps
+from django.core.management import call_command
+
+NS = {"sm": sitemaps.XMLNS}
+
+
+def get_locations(xml):
+    return [
+        loc.text for loc in ElementTree.fromstring(xml).iterfind(".//sm:loc", NS)
+    ]
+
+
+@pytest.mark.django_db
+def test_sitemap_views(
+        client, post_with_published_location, posts_with_unpublished_category
+):
+    post = post_with_published_location
+    response = client.get("/sitemap.xml")
+    assert response.status_code == HTTPStatus.OK
+    sections = get_locations(response.content)
+    assert "http://testserver/sitemap-posts-1.xml" in sections
+
+    response = client.get("/sitemap-posts-1.xml")
+    locations = get_locations(b"".join(response.streaming_content))
+    assert locations == [f"http://testserver/posts/{post.id}/"]
+
+    response = client.get("/sitemap-authors-1.xml")
+    locations = get_locations(b"".join(response.streaming_content))
+    assert locations == [
+        f"http://testserver/profile/{post.author.username}/"
+    ]
+    assert client.get("/sitemap-unknown-1.xml").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_pages_are_primary_key_ranges(
+        client, monkeypatch, mixer, published_category
+):
+    monkeypatch.setattr(sitemaps, "SITEMAP_LIMIT", 2)
+    posts = mixer.cycle(3).blend("blog.Post", category=published_category)
+    last_page = (posts[-1].pk - 1) // 2 + 1
+    response = client.get("/sitemap.xml")
+    sections = get_locations(response.content)
+    assert (
+        f"http://testserver/sitemap-posts-{last_page}.xml" in sections
+    )
+    assert f"http://testserver/sitemap-posts-{last_page + 1}.xml" not in (
+        sections
+    )
+
+    response = client.get(f"/sitemap-posts-{last_page}.xml")
+    locations = get_locations(b"".join(response.streaming_content))
+    assert f"http://testserver/posts/{posts[-1].pk}/" in locations
+    assert len(locations) <= 2
+    assert client.get(f"/sitemap-posts-{last_page + 1}.xml").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.django_db
+def test_generate_sitemaps_command(
+        tmp_path, monkeypatch, mixer, published_category
+):
+    monkeypatch.setattr(sitemaps, "SITEMAP_LIMIT", 2)
+    posts = mixer.cycle(5).blend(
+        "blog.Post", category=published_category
+    )
+    call_command(
+        "generate_sitemaps", output=tmp_path, base_url="https://blog.test"
+    )
+    index = get_locations((tmp_path / "sitemap.xml").read_bytes())
+    post_files = [
+        location for location in index if "sitemap-posts-" in location
+    ]
+    assert len(post_files) == 3
+    post_locations = []
+    for location in post_files:
+        post_locations += get_locations(
+            (tmp_path / location.rsplit("/", 1)[1]).read_bytes()
+        )
+    assert sorted(post_locations) == sorted(
+        f"https://blog.test/posts/{post.id}/" for post in posts
+    )
@@ -0,0 +1,54 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def slow_log(caplog):
+    logger = logging.getLogger("monitoring.slow_requests")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+def test_slow_request_logged_with_query_plans(
+        settings, slow_log, client, post_with_published_location
+):
+    settings.SLOW_REQUEST_MS = 0
+    client.get("/")
+    (record,) = slow_log.records
+    entry = json.loads(record.getMessage())
+    assert entry["view"] == "blog:index"
+    assert entry["query_count"] == len(entry["queries"]) > 0
+    assert all("ms" in query for query in entry["queries"])
+    plans = [query["plan"] for query in entry["queries"] if "plan" in query]
+    assert plans and all(plans)
+    assert any("post" in str(plan).lower() for plan in plans)
+
+
+@pytest.mark.django_db
+def test_fast_requests_not_logged(settings, slow_log, client):
+    settings.SLOW_REQUEST_MS = 60_000
+    client.get("/pages/about/")
+    settings.SLOW_REQUEST_MS = None
+    client.get("/pages/about/")
+    assert not slow_log.records
+
+
+@pytest.mark.django_db
+def test_query_params_are_redacted(settings, slow_log, client, user):
+    settings.SLOW_REQUEST_MS = 0
+    client.get(f"/profile/{user.username}/")
+    settings.SLOW_LOG_RAW_PARAMS = True
+    client.get(f"/profile/{user.username}/")
+    redacted, raw = (
+        json.loads(record.getMessage()) for record in slow_log.records
+    )
+    assert user.username not in json.dumps(redacted["queries"],
+                                           ensure_ascii=False)
+    assert all("params" not in query for query in redacted["queries"])
+    assert ["str"] in [query.get("param_types") for query in
+                       redacted["queries"]]
+    assert user.username in json.dumps(raw["queries"], ensure_ascii=False)
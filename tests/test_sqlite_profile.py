@@ -0,0 +1,31 @@
+import pytest
+from blogicum.sqlite import get_init_command, get_options
+from django.db import connection
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        get_options("turbo")
+
+
+def test_default_profile_keeps_sqlite_defaults():
+    assert get_options("default") == {}
+
+
+def test_production_profile_options():
+    options = get_options("production")
+    assert "PRAGMA journal_mode=WAL" in options["init_command"]
+    assert options["transaction_mode"] == "IMMEDIATE"
+    assert options["init_command"] == get_init_command("production")
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connection(settings):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1, "Ожидается synchronous=NORMAL"
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == 2, "Ожидается temp_store=MEMORY"
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == 5000
+    assert settings.DATABASES["default"]["CONN_HEALTH_CHECKS"]
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+import pytest
+from blog.models import Post
+from django.template import engines
+from monitoring.templates import TemplateQueryError
+
+
+@pytest.fixture(autouse=True)
+def strict_templates(settings):
+    settings.STRICT_TEMPLATE_QUERIES = True
+
+
+@pytest.mark.django_db
+def test_lazy_relation_in_template_fails_with_line(
+        post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    template = engines["django"].from_string(
+        "{{ post.title }}\n{{ post.author.username }}"
+    )
+    with pytest.raises(TemplateQueryError, match="строка 2"):
+        template.render({"post": post})
+
+
+@pytest.mark.django_db
+def test_blog_pages_render_without_queries(
+        client, user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=post.author)
+    urls = (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        for some_client in (client, user_client):
+            assert some_client.get(url).status_code == HTTPStatus.OK, url
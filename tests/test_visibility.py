@@ -0,0 +1,53 @@
+import pytest
+from blog.models import Post
+from blog.services import filter_visible_posts
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_visibility_flag_follows_post_and_category(
+        post_with_published_location
+):
+    post = post_with_published_location
+    assert Post.objects.get(pk=post.pk).is_visible
+
+    category = post.category
+    category.is_published = False
+    category.save()
+    assert not Post.objects.get(pk=post.pk).is_visible
+
+    category.is_published = True
+    category.save()
+    post.is_published = False
+    post.save()
+    assert not Post.objects.get(pk=post.pk).is_visible
+
+
+@pytest.mark.django_db
+def test_visible_posts_query_has_no_join():
+    sql = str(filter_visible_posts(Post.objects.all()).query)
+    assert "JOIN" not in sql
+
+
+@pytest.mark.django_db
+def test_refresh_visible_posts_repairs_bulk_updates(
+        post_with_published_location
+):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+    call_command("refresh_visible_posts")
+    assert Post.objects.get(pk=post.pk).is_visible
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("field", ["is_published", "category"])
+def test_partial_save_updates_visibility_flag(
+        post_with_published_location, mixer, field
+):
+    post = post_with_published_location
+    if field == "is_published":
+        post.is_published = False
+    else:
+        post.category = mixer.blend("blog.Category", is_published=False)
+    post.save(update_fields=[field])
+    assert not Post.objects.get(pk=post.pk).is_visible
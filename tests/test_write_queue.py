@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from blog import write_queue
+from blog.models import Comment
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_burst_goes_through_queue(
+        settings, mixer, post_with_published_location
+):
+    settings.BLOG_WRITE_QUEUE = True
+    post = post_with_published_location
+    comments = [
+        Comment(text=f"Комментарий {number}", post=post, author=post.author)
+        for number in range(20)
+    ]
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        saved = list(executor.map(write_queue.save, comments))
+    assert all(comment.pk for comment in saved)
+    assert len({comment.pk for comment in saved}) == 20
+    assert Comment.objects.filter(post=post).count() == 20
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_batch_saves_valid_objects(mixer, post_with_published_location):
+    post = post_with_published_location
+    queue = write_queue.WriteQueue()
+    valid = Comment(text="Корректный", post=post, author=post.author)
+    broken = Comment(text="Без поста", post_id=10 ** 9, author=post.author)
+    items = [(comment, "default", write_queue.Future())
+             for comment in (valid, broken)]
+    queue.flush(items)
+    assert items[0][2].result().pk is not None
+    assert items[1][2].exception() is not None
+    assert list(Comment.objects.values_list("text", flat=True)) == [
+        "Корректный"
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_view_with_queue(
+        settings, user_client, post_with_published_location
+):
+    settings.BLOG_WRITE_QUEUE = True
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Через очередь"}
+    )
+    comment = Comment.objects.get(text="Через очередь")
+    assert response.status_code == HTTPStatus.FOUND
+    assert response["Location"].endswith(f"#comment_{comment.id}")
+
+
+class StalledQueue(write_queue.WriteQueue):
+    def start(self):
+        pass
+
+
+@pytest.mark.django_db(transaction=True)
+def test_timed_out_write_is_cancelled(
+        settings, monkeypatch, user_client, post_with_published_location
+):
+    settings.BLOG_WRITE_QUEUE = True
+    monkeypatch.setattr(write_queue, "WRITE_QUEUE_TIMEOUT", 0.01)
+    stalled = StalledQueue()
+    monkeypatch.setattr(write_queue, "_write_queue", stalled)
+    post = post_with_published_location
+
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Не дождался"}
+    )
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "Retry-After" in response
+
+    # Поток-писатель, запущенный позже, отменённый объект не берёт
+    valid = Comment(text="Дождался", post=post, author=post.author)
+    item = (valid, "default", write_queue.Future())
+    stalled.queue.put(item)
+    assert stalled.take_batch() == [item]
+    assert not Comment.objects.filter(text="Не дождался").exists()